@@ -3,42 +3,54 @@
 
 from .member_functions import (
     register_member,
+    register_members_bulk,
     update_profile,
     add_fitness_goal,
     log_health_metric,
+    log_health_metrics_bulk,
     schedule_pt_session
 )
 
 from .trainer_functions import (
     set_availability,
     view_schedule,
+    iter_schedule,
     lookup_member
 )
 
 from .admin_functions import (
     assign_room_booking,
     log_maintenance_issue,
+    log_maintenance_issues_bulk,
     update_maintenance_status,
     create_invoice,
-    record_payment
+    record_payment,
+    create_invoices_bulk,
+    record_payments_bulk
 )
 
 __all__ = [
     # Member functions
     'register_member',
+    'register_members_bulk',
     'update_profile',
     'add_fitness_goal',
     'log_health_metric',
+    'log_health_metrics_bulk',
     'schedule_pt_session',
     # Trainer functions
     'set_availability',
     'view_schedule',
+    'iter_schedule',
     'lookup_member',
     # Admin functions
     'assign_room_booking',
     'log_maintenance_issue',
+    'log_maintenance_issues_bulk',
     'update_maintenance_status',
     'create_invoice',
-    'record_payment'
+    'record_payment',
+    'create_invoices_bulk',
+    'record_payments_bulk'
 ]
 
@@ -2,43 +2,161 @@
 Admin Staff Functions Implementation
 """
 
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.orm.util import identity_key
+from sqlalchemy import select, exists, insert, update, or_, bindparam
 from sqlalchemy.exc import IntegrityError
-from datetime import date, datetime
-from models import Room, PersonalTrainingSession, MaintenanceIssue, AdminStaff, Invoice, Member
+from datetime import date, datetime, timedelta
+from models import Room, PersonalTrainingSession, MaintenanceIssue, Invoice, Member, AdminStaff
 from typing import Optional, List
+from .existence import member_exists, room_exists, admin_exists
+from .validation import violated_constraint, validate_id, validate_text
+
+
+_ONE_YEAR = timedelta(weeks=52)
+
+# Allowed maintenance values; the tuples keep display order for error messages
+_PRIORITY_LEVELS = ('Low', 'Medium', 'High', 'Critical')
+_ISSUE_STATUSES = ('Open', 'In Progress', 'Resolved', 'Closed')
+_VALID_PRIORITIES = frozenset(_PRIORITY_LEVELS)
+_VALID_STATUSES = frozenset(_ISSUE_STATUSES)
+_FINISHED_STATUSES = frozenset(('Resolved', 'Closed'))
+
+# Invoice amounts are stored as integer cents
+_MAX_INVOICE_CENTS = 100_000_000  # $1M limit
+
+# Constraint names reported by PostgreSQL for the violations we translate
+_ROOM_OVERLAP_CONSTRAINT = 'no_room_overlap'
+_INVOICE_NUMBER_CONSTRAINT = 'Invoice_InvoiceNumber_key'
+
+
+def _expire_loaded(db: Session, model, pk: int) -> None:
+    """
+    Expire the session's copy of a row changed by a Core-style UPDATE, if one
+    is loaded. SessionLocal keeps state after commit (expire_on_commit=False),
+    so without this a long-lived session would keep serving the old values.
+    """
+    loaded = db.identity_map.get(identity_key(model, pk))
+    if loaded is not None:
+        db.expire(loaded)
+
+
+def _room_conflict_message(db: Session, session_id: int, room_id: int) -> Optional[str]:
+    """Describe the booking in room_id that overlaps session_id, if there is one."""
+    other = aliased(PersonalTrainingSession)
+    conflicting_booking = db.execute(
+        select(other.SessionID, other.StartTime, other.SessionDate)
+        .join(PersonalTrainingSession, PersonalTrainingSession.SessionID == session_id)
+        .where(
+            other.RoomID == room_id,
+            other.SessionDate == PersonalTrainingSession.SessionDate,
+            other.StartTime < PersonalTrainingSession.EndTime,
+            other.EndTime > PersonalTrainingSession.StartTime,
+            other.SessionID != session_id
+        )
+        .limit(1)
+    ).first()
+    if not conflicting_booking:
+        return None
+    return (
+        f"Room is already booked for session {conflicting_booking.SessionID} "
+        f"at {conflicting_booking.StartTime} on {conflicting_booking.SessionDate}."
+    )
 
 
 def assign_room_booking(
     db: Session,
     session_id: int,
     room_id: int
-) -> PersonalTrainingSession:
+) -> dict:
     """
     3.3.1 Room Booking
     Assign rooms for sessions or classes. Prevent double-booking.
+    Returns: The updated session row as a dict
     """
+    today = date.today()
+    
     # Edge case: Validate IDs
-    if not isinstance(session_id, int) or session_id <= 0:
-        raise ValueError("Session ID must be a positive integer.")
-    if not isinstance(room_id, int) or room_id <= 0:
-        raise ValueError("Room ID must be a positive integer.")
-    
-    # Verify session exists
-    session = db.query(PersonalTrainingSession).filter(
-        PersonalTrainingSession.SessionID == session_id
+    if __debug__:
+        validate_id(session_id, "Session ID")
+        validate_id(room_id, "Room ID")
+    
+    # Single round-trip: the UPDATE only matches when the session is upcoming,
+    # the room exists, differs from the current one, is large enough for a
+    # group class and has no overlapping booking. The no_room_overlap
+    # exclusion constraint (when installed) also closes the race between
+    # two concurrent bookings.
+    room_fits = exists().where(
+        Room.RoomID == room_id,
+        or_(
+            PersonalTrainingSession.SessionType.is_distinct_from('Group Class'),
+            PersonalTrainingSession.MaxCapacity.is_(None),
+            Room.RoomCapacity.is_(None),
+            PersonalTrainingSession.MaxCapacity <= Room.RoomCapacity
+        )
+    )
+    other = aliased(PersonalTrainingSession)
+    room_taken = exists().where(
+        other.RoomID == room_id,
+        other.SessionDate == PersonalTrainingSession.SessionDate,
+        other.StartTime < PersonalTrainingSession.EndTime,
+        other.EndTime > PersonalTrainingSession.StartTime,
+        other.SessionID != PersonalTrainingSession.SessionID
+    )
+    stmt = (
+        update(PersonalTrainingSession)
+        .where(
+            PersonalTrainingSession.SessionID == session_id,
+            PersonalTrainingSession.SessionDate >= today,
+            PersonalTrainingSession.RoomID.is_distinct_from(room_id),
+            room_fits,
+            ~room_taken
+        )
+        .values({PersonalTrainingSession.RoomID: room_id})
+        .returning(*PersonalTrainingSession.__table__.c)
+    )
+    
+    try:
+        session = db.execute(
+            stmt, execution_options={"synchronize_session": False}
+        ).mappings().first()
+        if session:
+            db.commit()
+            _expire_loaded(db, PersonalTrainingSession, session_id)
+            return dict(session)
+    except IntegrityError as e:
+        db.rollback()
+        if violated_constraint(e) == _ROOM_OVERLAP_CONSTRAINT:
+            message = _room_conflict_message(db, session_id, room_id)
+            raise ValueError(message or f"Room {room_id} is already booked at that time.") from e
+        raise ValueError(f"Failed to assign room: {str(e)}") from e
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Failed to assign room: {str(e)}") from e
+    
+    # No row updated: look up session and room to report the precise reason
+    session = db.execute(
+        select(
+            PersonalTrainingSession.SessionDate,
+            PersonalTrainingSession.SessionType,
+            PersonalTrainingSession.MaxCapacity,
+            PersonalTrainingSession.RoomID
+        ).where(PersonalTrainingSession.SessionID == session_id)
     ).first()
     
     if not session:
         raise ValueError(f"Session with ID {session_id} not found.")
     
     # Edge case: Check if session is in the past
-    if session.SessionDate < date.today():
+    if session.SessionDate < today:
         raise ValueError("Cannot assign room to a past session.")
     
+    room_capacity = db.execute(
+        select(Room.RoomCapacity).where(Room.RoomID == room_id)
+    ).first()
+    
     # Verify room exists
-    room = db.query(Room).filter(Room.RoomID == room_id).first()
-    if not room:
+    if not room_capacity:
         raise ValueError(f"Room with ID {room_id} not found.")
     
     # Edge case: Check if room is already assigned to this session
@@ -47,106 +165,98 @@ def assign_room_booking(
     
     # Edge case: Validate room capacity for group classes
     if session.SessionType == 'Group Class' and session.MaxCapacity:
-        if room.RoomCapacity and session.MaxCapacity > room.RoomCapacity:
+        if room_capacity.RoomCapacity and session.MaxCapacity > room_capacity.RoomCapacity:
             raise ValueError(
-                f"Session max capacity ({session.MaxCapacity}) exceeds room capacity ({room.RoomCapacity})."
+                f"Session max capacity ({session.MaxCapacity}) exceeds room capacity ({room_capacity.RoomCapacity})."
             )
     
-    # Check for room conflicts 
-    conflicting_booking = db.query(PersonalTrainingSession).filter(
-        PersonalTrainingSession.RoomID == room_id,
-        PersonalTrainingSession.SessionDate == session.SessionDate,
-        PersonalTrainingSession.StartTime < session.EndTime,
-        PersonalTrainingSession.EndTime > session.StartTime,
-        PersonalTrainingSession.SessionID != session_id  # Exclude current session
-    ).first()
-    
-    if conflicting_booking:
-        raise ValueError(
-            f"Room is already booked for session {conflicting_booking.SessionID} "
-            f"at {conflicting_booking.StartTime} on {conflicting_booking.SessionDate}."
-        )
-    
-    try:
-        # Update session with room assignment 
-        session.RoomID = room_id
-        db.commit()
-        db.refresh(session)
-        
-        return session
-    except Exception as e:
-        db.rollback()
-        raise ValueError(f"Failed to assign room: {str(e)}") from e
+    # Check for room conflicts
+    message = _room_conflict_message(db, session_id, room_id)
+    if message:
+        raise ValueError(message)
+    raise ValueError("Failed to assign room: the session changed concurrently, please retry.")
 
 
-def log_maintenance_issue(
-    db: Session,
+def _validate_issue_fields(
     room_id: int,
     admin_id: int,
     issue_description: str,
     equipment_name: Optional[str] = None,
     priority: str = 'Medium',
-    reported_date: Optional[date] = None
-) -> MaintenanceIssue:
-    """
-    3.3.2 Equipment Maintenance - Log new issue
-    Log issues, track repair status, associate with room/equipment.
-    """
+    reported_date: Optional[date] = None,
+    today: Optional[date] = None
+) -> None:
+    """Validate maintenance issue input that does not need the database."""
+    today = today or date.today()
+    
     # Edge case: Validate IDs
-    if not isinstance(room_id, int) or room_id <= 0:
-        raise ValueError("Room ID must be a positive integer.")
-    if not isinstance(admin_id, int) or admin_id <= 0:
-        raise ValueError("Admin ID must be a positive integer.")
+    if __debug__:
+        validate_id(room_id, "Room ID")
+        validate_id(admin_id, "Admin ID")
     
     # Edge case: Validate issue_description
-    if not issue_description or not issue_description.strip():
-        raise ValueError("Issue description is required and cannot be empty.")
-    if len(issue_description) > 1000:
-        raise ValueError("Issue description cannot exceed 1000 characters.")
+    validate_text(issue_description, "Issue description", 1000, required=True)
     
     # Edge case: Validate equipment_name
-    if equipment_name and len(equipment_name) > 100:
-        raise ValueError("Equipment name cannot exceed 100 characters.")
+    validate_text(equipment_name, "Equipment name", 100)
     
     # Edge case: Validate priority
-    valid_priorities = ['Low', 'Medium', 'High', 'Critical']
-    if priority not in valid_priorities:
-        raise ValueError(f"Priority must be one of: {valid_priorities}")
+    if priority not in _VALID_PRIORITIES:
+        raise ValueError(f"Priority must be one of: {list(_PRIORITY_LEVELS)}")
     
     # Edge case: Validate reported_date
     if reported_date:
-        if reported_date > date.today():
+        if reported_date > today:
             raise ValueError("Reported date cannot be in the future.")
-        if (date.today() - reported_date).days > 3650:  # 10 years
+        if (today - reported_date).days > 3650:  # 10 years
             raise ValueError("Reported date is too far in the past.")
+
+
+def log_maintenance_issue(
+    db: Session,
+    room_id: int,
+    admin_id: int,
+    issue_description: str,
+    equipment_name: Optional[str] = None,
+    priority: str = 'Medium',
+    reported_date: Optional[date] = None
+) -> dict:
+    """
+    3.3.2 Equipment Maintenance - Log new issue
+    Log issues, track repair status, associate with room/equipment.
+    Returns: The created issue row as a dict
+    """
+    today = date.today()
+    _validate_issue_fields(
+        room_id, admin_id, issue_description, equipment_name,
+        priority, reported_date, today=today
+    )
     
     # Verify room exists
-    room = db.query(Room).filter(Room.RoomID == room_id).first()
-    if not room:
+    if not room_exists(db, room_id):
         raise ValueError(f"Room with ID {room_id} not found.")
     
     # Verify admin exists
-    admin = db.query(AdminStaff).filter(AdminStaff.AdminID == admin_id).first()
-    if not admin:
+    if not admin_exists(db, admin_id):
         raise ValueError(f"Admin staff with ID {admin_id} not found.")
     
     try:
-        # Create new maintenance issue using ORM
-        new_issue = MaintenanceIssue(
-            RoomID=room_id,
-            AdminID=admin_id,
-            IssueDescription=issue_description.strip(),
-            EquipmentName=equipment_name.strip() if equipment_name else None,
-            ReportedDate=reported_date or date.today(),
-            Priority=priority,
-            Status='Open'
-        )
+        # INSERT ... RETURNING hands back the stored row without a flush/refresh
+        new_issue = db.execute(
+            insert(MaintenanceIssue).values(
+                RoomID=room_id,
+                AdminID=admin_id,
+                IssueDescription=issue_description.strip(),
+                EquipmentName=equipment_name.strip() if equipment_name else None,
+                ReportedDate=reported_date or today,
+                Priority=priority,
+                Status='Open'
+            ).returning(*MaintenanceIssue.__table__.c)
+        ).mappings().one()
         
-        db.add(new_issue)
         db.commit()
-        db.refresh(new_issue)
         
-        return new_issue
+        return dict(new_issue)
     except Exception as e:
         db.rollback()
         raise ValueError(f"Failed to log maintenance issue: {str(e)}") from e
@@ -159,79 +269,90 @@ def update_maintenance_status(
     assigned_repair_date: Optional[date] = None,
     resolution_date: Optional[date] = None,
     resolution_notes: Optional[str] = None
-) -> MaintenanceIssue:
+) -> dict:
+    today = date.today()
     
     # Edge case: Validate issue_id
-    if not isinstance(issue_id, int) or issue_id <= 0:
-        raise ValueError("Issue ID must be a positive integer.")
+    if __debug__:
+        validate_id(issue_id, "Issue ID")
     
     # Edge case: Check if at least one field is provided
     if all(field is None for field in [status, assigned_repair_date, resolution_date, resolution_notes]):
         raise ValueError("At least one field must be provided for update.")
     
-    # Query issue using ORM
-    issue = db.query(MaintenanceIssue).filter(MaintenanceIssue.IssueID == issue_id).first()
+    # Query only the columns the validation rules depend on
+    issue = db.execute(
+        select(MaintenanceIssue.Status, MaintenanceIssue.ReportedDate).where(
+            MaintenanceIssue.IssueID == issue_id
+        )
+    ).first()
     
     if not issue:
         raise ValueError(f"Maintenance issue with ID {issue_id} not found.")
     
     # Edge case: Validate status
-    valid_statuses = ['Open', 'In Progress', 'Resolved', 'Closed']
-    if status and status not in valid_statuses:
-        raise ValueError(f"Status must be one of: {valid_statuses}")
+    if status and status not in _VALID_STATUSES:
+        raise ValueError(f"Status must be one of: {list(_ISSUE_STATUSES)}")
     
     # Edge case: Validate status transitions
     if status:
         if issue.Status == 'Closed' and status != 'Closed':
             raise ValueError("Cannot change status of a closed issue.")
-        if issue.Status == 'Resolved' and status not in ['Resolved', 'Closed']:
+        if issue.Status == 'Resolved' and status not in _FINISHED_STATUSES:
             raise ValueError("Resolved issues can only be closed.")
     
     # Edge case: Validate assigned_repair_date
     if assigned_repair_date:
         if assigned_repair_date < issue.ReportedDate:
             raise ValueError("Assigned repair date cannot be before reported date.")
-        from datetime import timedelta
-        if assigned_repair_date > date.today() + timedelta(weeks=52):  # 1 year
+        if assigned_repair_date > today + _ONE_YEAR:
             raise ValueError("Assigned repair date cannot be more than 1 year in the future.")
     
     # Edge case: Validate resolution_date
     if resolution_date:
-        if issue.Status not in ['Resolved', 'Closed']:
+        if issue.Status not in _FINISHED_STATUSES:
             raise ValueError("Cannot set resolution date unless status is 'Resolved' or 'Closed'.")
         if resolution_date < issue.ReportedDate:
             raise ValueError("Resolution date cannot be before reported date.")
-        if resolution_date > date.today():
+        if resolution_date > today:
             raise ValueError("Resolution date cannot be in the future.")
         if assigned_repair_date and resolution_date < assigned_repair_date:
             raise ValueError("Resolution date cannot be before assigned repair date.")
     
     # Edge case: Validate resolution_notes
-    if resolution_notes and len(resolution_notes) > 1000:
-        raise ValueError("Resolution notes cannot exceed 1000 characters.")
+    validate_text(resolution_notes, "Resolution notes", 1000)
+    
+    # Only the provided fields are written
+    values = {}
+    if status:
+        values[MaintenanceIssue.Status] = status
+    if assigned_repair_date:
+        values[MaintenanceIssue.AssignedRepairDate] = assigned_repair_date
+    if resolution_date:
+        values[MaintenanceIssue.ResolutionDate] = resolution_date
+    if resolution_notes:
+        values[MaintenanceIssue.ResolutionNotes] = resolution_notes.strip()
     
     try:
-        # Update fields using ORM
-        if status:
-            issue.Status = status
-        if assigned_repair_date:
-            issue.AssignedRepairDate = assigned_repair_date
-        if resolution_date:
-            issue.ResolutionDate = resolution_date
-        if resolution_notes:
-            issue.ResolutionNotes = resolution_notes.strip()
+        # Single UPDATE ... WHERE, no fetch-then-mutate of the ORM object
+        updated_issue = db.execute(
+            update(MaintenanceIssue)
+            .where(MaintenanceIssue.IssueID == issue_id)
+            .values(values)
+            .returning(*MaintenanceIssue.__table__.c),
+            execution_options={"synchronize_session": False}
+        ).mappings().one()
         
         db.commit()
-        db.refresh(issue)
+        _expire_loaded(db, MaintenanceIssue, issue_id)
         
-        return issue
+        return dict(updated_issue)
     except Exception as e:
         db.rollback()
         raise ValueError(f"Failed to update maintenance status: {str(e)}") from e
 
 
-def create_invoice(
-    db: Session,
+def _validate_invoice_fields(
     payer_id: int,
     invoice_number: str,
     invoice_date: date,
@@ -239,33 +360,34 @@ def create_invoice(
     amount: float,
     service_description: str,
     session_id: Optional[int] = None,
-    payment_method: Optional[str] = None
-) -> Invoice:
+    payment_method: Optional[str] = None,
+    today: Optional[date] = None
+) -> int:
+    """
+    Validate invoice input that does not need the database.
+    Returns: The amount converted to integer cents
+    """
+    today = today or date.today()
     
     # Edge case: Validate payer_id
-    if not isinstance(payer_id, int) or payer_id <= 0:
-        raise ValueError("Payer ID must be a positive integer.")
+    if __debug__:
+        validate_id(payer_id, "Payer ID")
     
     # Edge case: Validate invoice_number
-    if not invoice_number or not invoice_number.strip():
-        raise ValueError("Invoice number is required and cannot be empty.")
-    if len(invoice_number) > 50:
-        raise ValueError("Invoice number cannot exceed 50 characters.")
+    validate_text(invoice_number, "Invoice number", 50, required=True)
     
     # Edge case: Validate service_description
-    if not service_description or not service_description.strip():
-        raise ValueError("Service description is required and cannot be empty.")
-    if len(service_description) > 500:
-        raise ValueError("Service description cannot exceed 500 characters.")
+    validate_text(service_description, "Service description", 500, required=True)
     
     # Edge case: Validate session_id
-    if session_id is not None and (not isinstance(session_id, int) or session_id <= 0):
-        raise ValueError("Session ID must be a positive integer if provided.")
+    if __debug__ and session_id is not None:
+        if not isinstance(session_id, int) or session_id <= 0:
+            raise ValueError("Session ID must be a positive integer if provided.")
     
     # Edge case: Validate dates
-    if invoice_date > date.today():
+    if invoice_date > today:
         raise ValueError("Invoice date cannot be in the future.")
-    if (date.today() - invoice_date).days > 3650:  # 10 years
+    if (today - invoice_date).days > 3650:  # 10 years
         raise ValueError("Invoice date is too far in the past.")
     
     if due_date < invoice_date:
@@ -273,112 +395,421 @@ def create_invoice(
     if (due_date - invoice_date).days > 365:  # 1 year
         raise ValueError("Due date cannot be more than 1 year after invoice date.")
     
-    # Edge case: Validate amount
-    if not isinstance(amount, (int, float)):
-        raise ValueError("Amount must be a number.")
-    if amount <= 0:
+    # Edge case: Validate amount (converted to cents once, at the boundary)
+    try:
+        amount_cents = int(round(amount * 100))
+    except TypeError:
+        raise ValueError("Amount must be a number.") from None
+    except ValueError:
+        # Edge case: NaN has no integer value
+        raise ValueError("Amount must be a number.") from None
+    except OverflowError:
+        # Edge case: +/-inf
+        if amount < 0:
+            raise ValueError("Invoice amount must be positive.") from None
+        raise ValueError("Invoice amount exceeds maximum limit.") from None
+    if amount_cents < 1:
         raise ValueError("Invoice amount must be positive.")
-    if amount > 1000000:  # $1M limit
+    if amount_cents > _MAX_INVOICE_CENTS:
         raise ValueError("Invoice amount exceeds maximum limit.")
     
     # Edge case: Validate payment_method
-    if payment_method and len(payment_method) > 50:
-        raise ValueError("Payment method cannot exceed 50 characters.")
+    validate_text(payment_method, "Payment method", 50)
+    
+    return amount_cents
+
+
+def create_invoice(
+    db: Session,
+    payer_id: int,
+    invoice_number: str,
+    invoice_date: date,
+    due_date: date,
+    amount: float,
+    service_description: str,
+    session_id: Optional[int] = None,
+    payment_method: Optional[str] = None
+) -> dict:
+    today = date.today()
+    
+    amount_cents = _validate_invoice_fields(
+        payer_id, invoice_number, invoice_date, due_date, amount,
+        service_description, session_id, payment_method, today
+    )
+    
+    if session_id:
+        # Payer existence and session ownership in a single round-trip
+        checks = db.execute(
+            select(
+                exists().where(Member.MemberID == payer_id).label('payer_exists'),
+                select(PersonalTrainingSession.MemberID).where(
+                    PersonalTrainingSession.SessionID == session_id
+                ).scalar_subquery().label('session_owner')
+            )
+        ).one()
+        payer_exists = checks.payer_exists
+    else:
+        payer_exists = member_exists(db, payer_id)
     
     # Verify payer (member) exists
-    payer = db.query(Member).filter(Member.MemberID == payer_id).first()
-    if not payer:
+    if not payer_exists:
         raise ValueError(f"Member with ID {payer_id} not found.")
     
     # Verify session exists if provided
     if session_id:
-        session = db.query(PersonalTrainingSession).filter(
-            PersonalTrainingSession.SessionID == session_id
-        ).first()
-        if not session:
+        if checks.session_owner is None:
             raise ValueError(f"Session with ID {session_id} not found.")
         
         # Edge case: Verify session belongs to payer
-        if session.MemberID != payer_id:
+        if checks.session_owner != payer_id:
             raise ValueError(f"Session {session_id} does not belong to member {payer_id}.")
     
-    # Edge case: Check if invoice number already exists
-    existing = db.query(Invoice).filter(Invoice.InvoiceNumber == invoice_number).first()
-    if existing:
-        raise ValueError(f"Invoice number '{invoice_number}' already exists.")
-    
     try:
-        # Create new invoice using ORM
-        new_invoice = Invoice(
-            InvoiceNumber=invoice_number.strip(),
-            PayerID=payer_id,
-            SessionID=session_id,
-            InvoiceDate=invoice_date,
-            DueDate=due_date,
-            Amount=round(amount, 2),  # Round to 2 decimal places
-            PaymentMethod=payment_method.strip() if payment_method else None,
-            PaymentStatus='Pending',
-            ServiceDescription=service_description.strip()
-        )
+        # Duplicate invoice numbers are rejected by the UNIQUE constraint
+        new_invoice = db.execute(
+            insert(Invoice).values(
+                InvoiceNumber=invoice_number.strip(),
+                PayerID=payer_id,
+                SessionID=session_id,
+                InvoiceDate=invoice_date,
+                DueDate=due_date,
+                Amount=amount_cents,
+                PaymentMethod=payment_method.strip() if payment_method else None,
+                PaymentStatus='Pending',
+                ServiceDescription=service_description.strip()
+            ).returning(*Invoice.__table__.c)
+        ).mappings().one()
         
-        db.add(new_invoice)
         db.commit()
-        db.refresh(new_invoice)
-        return new_invoice
+        return dict(new_invoice)
     except IntegrityError as e:
         db.rollback()
-        raise ValueError(f"Invoice number '{invoice_number}' already exists.") from e
+        if violated_constraint(e) == _INVOICE_NUMBER_CONSTRAINT:
+            raise ValueError(f"Invoice number '{invoice_number}' already exists.") from e
+        raise ValueError(f"Failed to create invoice: {str(e)}") from e
     except Exception as e:
         db.rollback()
         raise ValueError(f"Failed to create invoice: {str(e)}") from e
 
 
-def record_payment(
-    db: Session,
+def _validate_payment_fields(
     invoice_id: int,
     payment_method: str,
-    paid_date: Optional[date] = None
-) -> Invoice:
+    paid_date: Optional[date] = None,
+    today: Optional[date] = None
+) -> None:
+    """Validate payment input that does not need the database."""
+    today = today or date.today()
     
     # Edge case: Validate invoice_id
-    if not isinstance(invoice_id, int) or invoice_id <= 0:
-        raise ValueError("Invoice ID must be a positive integer.")
+    if __debug__:
+        validate_id(invoice_id, "Invoice ID")
     
     # Edge case: Validate payment_method
-    if not payment_method or not payment_method.strip():
-        raise ValueError("Payment method is required and cannot be empty.")
-    if len(payment_method) > 50:
-        raise ValueError("Payment method cannot exceed 50 characters.")
+    validate_text(payment_method, "Payment method", 50, required=True)
     
     # Edge case: Validate paid_date (basic check before querying)
-    if paid_date and paid_date > date.today():
+    if paid_date and paid_date > today:
         raise ValueError("Paid date cannot be in the future.")
+
+
+def record_payment(
+    db: Session,
+    invoice_id: int,
+    payment_method: str,
+    paid_date: Optional[date] = None
+) -> dict:
+    today = date.today()
+    
+    _validate_payment_fields(invoice_id, payment_method, paid_date, today)
     
-    # Query invoice using ORM
-    invoice = db.query(Invoice).filter(Invoice.InvoiceID == invoice_id).first()
+    # Update only unpaid invoices; paid_date must not precede the invoice date
+    criteria = [
+        Invoice.InvoiceID == invoice_id,
+        Invoice.PaymentStatus.is_distinct_from('Paid')
+    ]
+    if paid_date:
+        criteria.append(Invoice.InvoiceDate <= paid_date)
     
-    if not invoice:
+    try:
+        invoice = db.execute(
+            update(Invoice)
+            .where(*criteria)
+            .values({
+                Invoice.PaymentStatus: 'Paid',
+                Invoice.PaymentMethod: payment_method.strip(),
+                Invoice.PaidDate: paid_date or today
+            })
+            .returning(*Invoice.__table__.c),
+            execution_options={"synchronize_session": False}
+        ).mappings().first()
+        
+        if invoice:
+            db.commit()
+            _expire_loaded(db, Invoice, invoice_id)
+            return dict(invoice)
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Failed to record payment: {str(e)}") from e
+    
+    # No row updated: look up the invoice to report the precise reason
+    existing = db.execute(
+        select(Invoice.PaymentStatus, Invoice.InvoiceDate).where(Invoice.InvoiceID == invoice_id)
+    ).first()
+    
+    if not existing:
         raise ValueError(f"Invoice with ID {invoice_id} not found.")
     
     # Edge case: Check if already paid
-    if invoice.PaymentStatus == 'Paid':
+    if existing.PaymentStatus == 'Paid':
         raise ValueError(f"Invoice {invoice_id} is already marked as paid.")
     
     # Edge case: Validate paid_date against invoice date
-    if paid_date and paid_date < invoice.InvoiceDate:
+    if paid_date is not None and paid_date < existing.InvoiceDate:
         raise ValueError("Paid date cannot be before invoice date.")
     
+    # The invoice changed between the UPDATE and this lookup
+    raise ValueError("Failed to record payment: the invoice changed concurrently, please retry.")
+
+
+def create_invoices_bulk(
+    db: Session,
+    invoices: List[dict]
+) -> List[int]:
+    """
+    Billing & Payment - Create many invoices at once
+    Batch variant of create_invoice() for back-office runs such as month-end billing.
+    Each dict takes create_invoice()'s keyword arguments. Every row is validated
+    first; the batch is then inserted in one statement, or not at all.
+    
+    Returns: IDs of the created invoices, in input order
+    """
+    if not invoices:
+        raise ValueError("At least one invoice must be provided.")
+    
+    today = date.today()
+    amounts_cents = []
+    for position, row in enumerate(invoices, start=1):
+        try:
+            amounts_cents.append(_validate_invoice_fields(**row, today=today))
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Invoice #{position}: {e}") from e
+    
+    # Edge case: Duplicate invoice numbers within the batch
+    invoice_numbers = [row['invoice_number'].strip() for row in invoices]
+    if len(set(invoice_numbers)) != len(invoice_numbers):
+        raise ValueError("Invoice numbers must be unique within the batch.")
+    
+    # Verify all payers exist with one IN query
+    payer_ids = {row['payer_id'] for row in invoices}
+    found_payers = set(db.execute(
+        select(Member.MemberID).where(Member.MemberID.in_(payer_ids))
+    ).scalars())
+    missing_payers = payer_ids - found_payers
+    if missing_payers:
+        raise ValueError(f"Member with ID {min(missing_payers)} not found.")
+    
+    # Verify referenced sessions exist and belong to their payers
+    session_ids = {row['session_id'] for row in invoices if row.get('session_id')}
+    if session_ids:
+        session_owners = dict(db.execute(
+            select(PersonalTrainingSession.SessionID, PersonalTrainingSession.MemberID).where(
+                PersonalTrainingSession.SessionID.in_(session_ids)
+            )
+        ).all())
+        for row in invoices:
+            session_id = row.get('session_id')
+            if not session_id:
+                continue
+            if session_id not in session_owners:
+                raise ValueError(f"Session with ID {session_id} not found.")
+            if session_owners[session_id] != row['payer_id']:
+                raise ValueError(f"Session {session_id} does not belong to member {row['payer_id']}.")
+    
+    # Edge case: Check if any invoice number already exists
+    existing_number = db.execute(
+        select(Invoice.InvoiceNumber).where(Invoice.InvoiceNumber.in_(invoice_numbers))
+    ).scalars().first()
+    if existing_number:
+        raise ValueError(f"Invoice number '{existing_number}' already exists.")
+    
+    rows = [
+        {
+            'InvoiceNumber': row['invoice_number'].strip(),
+            'PayerID': row['payer_id'],
+            'SessionID': row.get('session_id'),
+            'InvoiceDate': row['invoice_date'],
+            'DueDate': row['due_date'],
+            'Amount': amount_cents,
+            'PaymentMethod': row['payment_method'].strip() if row.get('payment_method') else None,
+            'PaymentStatus': 'Pending',
+            'ServiceDescription': row['service_description'].strip()
+        }
+        for row, amount_cents in zip(invoices, amounts_cents)
+    ]
+    
     try:
-        # Update payment information using ORM
-        invoice.PaymentStatus = 'Paid'
-        invoice.PaymentMethod = payment_method.strip()
-        invoice.PaidDate = paid_date or date.today()
-        
+        # Single multi-row INSERT ... RETURNING
+        invoice_ids = db.scalars(
+            insert(Invoice).returning(Invoice.InvoiceID, sort_by_parameter_order=True),
+            rows
+        ).all()
         db.commit()
-        db.refresh(invoice)
+        return invoice_ids
+    except IntegrityError as e:
+        db.rollback()
+        if violated_constraint(e) == _INVOICE_NUMBER_CONSTRAINT:
+            raise ValueError("One or more invoice numbers already exist.") from e
+        raise ValueError(f"Failed to create invoices: {str(e)}") from e
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Failed to create invoices: {str(e)}") from e
+
+
+def record_payments_bulk(
+    db: Session,
+    payments: List[dict]
+) -> int:
+    """
+    Billing & Payment - Record many payments at once
+    Batch variant of record_payment(). Each dict takes record_payment()'s keyword
+    arguments (invoice_id, payment_method, optional paid_date). All invoices are
+    checked with one query and updated in one executemany UPDATE, or not at all.
+    
+    Returns: Number of invoices marked as paid
+    """
+    if not payments:
+        raise ValueError("At least one payment must be provided.")
+    
+    today = date.today()
+    for position, row in enumerate(payments, start=1):
+        try:
+            _validate_payment_fields(**row, today=today)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Payment #{position}: {e}") from e
+    
+    # Edge case: Same invoice listed twice
+    invoice_ids = [row['invoice_id'] for row in payments]
+    if len(set(invoice_ids)) != len(invoice_ids):
+        raise ValueError("Each invoice can only be paid once per batch.")
+    
+    # Load the state of every invoice with one IN query
+    current = {
+        row.InvoiceID: row
+        for row in db.execute(
+            select(Invoice.InvoiceID, Invoice.PaymentStatus, Invoice.InvoiceDate).where(
+                Invoice.InvoiceID.in_(invoice_ids)
+            )
+        )
+    }
+    for row in payments:
+        invoice = current.get(row['invoice_id'])
+        if not invoice:
+            raise ValueError(f"Invoice with ID {row['invoice_id']} not found.")
+        if invoice.PaymentStatus == 'Paid':
+            raise ValueError(f"Invoice {row['invoice_id']} is already marked as paid.")
+        if row.get('paid_date') and row['paid_date'] < invoice.InvoiceDate:
+            raise ValueError("Paid date cannot be before invoice date.")
+    
+    params = [
+        {
+            'invoice_id': row['invoice_id'],
+            'payment_method': row['payment_method'].strip(),
+            'paid_date': row.get('paid_date') or today
+        }
+        for row in payments
+    ]
+    
+    invoice_table = Invoice.__table__
+    stmt = (
+        update(invoice_table)
+        .where(
+            invoice_table.c.InvoiceID == bindparam('invoice_id'),
+            invoice_table.c.PaymentStatus.is_distinct_from('Paid')
+        )
+        .values(
+            PaymentStatus='Paid',
+            PaymentMethod=bindparam('payment_method'),
+            PaidDate=bindparam('paid_date')
+        )
+    )
+    
+    try:
+        result = db.execute(stmt, params)
         
-        return invoice
+        # Edge case: An invoice was paid by someone else after the check above
+        if result.supports_sane_multi_rowcount() and result.rowcount != len(params):
+            raise ValueError("One or more invoices were paid concurrently; no payments recorded.")
+        
+        db.commit()
+        for invoice_id in invoice_ids:
+            _expire_loaded(db, Invoice, invoice_id)
+        return len(params)
     except Exception as e:
         db.rollback()
-        raise ValueError(f"Failed to record payment: {str(e)}") from e
+        if isinstance(e, ValueError):
+            raise
+        raise ValueError(f"Failed to record payments: {str(e)}") from e
+
 
+def log_maintenance_issues_bulk(
+    db: Session,
+    issues: List[dict]
+) -> List[int]:
+    """
+    3.3.2 Equipment Maintenance - Log many issues at once
+    Batch variant of log_maintenance_issue() for inspection rounds and imports.
+    Each dict takes log_maintenance_issue()'s keyword arguments. Rooms and staff
+    are checked with one query each; the batch is inserted in one statement.
+    
+    Returns: IDs of the created issues, in input order
+    """
+    if not issues:
+        raise ValueError("At least one maintenance issue must be provided.")
+    
+    today = date.today()
+    for position, row in enumerate(issues, start=1):
+        try:
+            _validate_issue_fields(**row, today=today)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Issue #{position}: {e}") from e
+    
+    # Verify all rooms and admins exist with one IN query each
+    room_ids = {row['room_id'] for row in issues}
+    missing_rooms = room_ids - set(db.execute(
+        select(Room.RoomID).where(Room.RoomID.in_(room_ids))
+    ).scalars())
+    if missing_rooms:
+        raise ValueError(f"Room with ID {min(missing_rooms)} not found.")
+    
+    admin_ids = {row['admin_id'] for row in issues}
+    missing_admins = admin_ids - set(db.execute(
+        select(AdminStaff.AdminID).where(AdminStaff.AdminID.in_(admin_ids))
+    ).scalars())
+    if missing_admins:
+        raise ValueError(f"Admin staff with ID {min(missing_admins)} not found.")
+    
+    rows = [
+        {
+            'RoomID': row['room_id'],
+            'AdminID': row['admin_id'],
+            'IssueDescription': row['issue_description'].strip(),
+            'EquipmentName': row['equipment_name'].strip() if row.get('equipment_name') else None,
+            'ReportedDate': row.get('reported_date') or today,
+            'Priority': row.get('priority', 'Medium'),
+            'Status': 'Open'
+        }
+        for row in issues
+    ]
+    
+    try:
+        # Single multi-row INSERT ... RETURNING
+        issue_ids = db.scalars(
+            insert(MaintenanceIssue).returning(MaintenanceIssue.IssueID, sort_by_parameter_order=True),
+            rows
+        ).all()
+        db.commit()
+        return issue_ids
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Failed to log maintenance issues: {str(e)}") from e
@@ -0,0 +1,76 @@
+"""
+Existence Checks Shared by the Member, Trainer and Admin Functions
+"""
+
+from collections import OrderedDict
+from time import monotonic
+from sqlalchemy.orm import Session
+from sqlalchemy import select, exists, lambda_stmt, bindparam
+from models import Member, Trainer, Room, AdminStaff
+
+
+# Hot lookup statements built with lambda_stmt so SQLAlchemy constructs and
+# caches them once; each call only supplies new bind parameter values.
+_member_exists_stmt = lambda_stmt(
+    lambda: select(exists().where(Member.MemberID == bindparam('entity_id')))
+)
+_trainer_exists_stmt = lambda_stmt(
+    lambda: select(exists().where(Trainer.TrainerID == bindparam('entity_id')))
+)
+_room_exists_stmt = lambda_stmt(
+    lambda: select(exists().where(Room.RoomID == bindparam('entity_id')))
+)
+_admin_exists_stmt = lambda_stmt(
+    lambda: select(exists().where(AdminStaff.AdminID == bindparam('entity_id')))
+)
+
+# Members, trainers, rooms and staff almost never disappear, so a positive
+# existence result is remembered for a short TTL (keyed by the database URL
+# that answered plus e.g. ("room", 3)) to skip repeat round-trips. Foreign
+# keys still guard the actual write. drop_tables()/init_db() clear it.
+EXISTS_CACHE_TTL = 60  # seconds
+EXISTS_CACHE_MAXSIZE = 10000
+_exists_cache = OrderedDict()
+
+
+def _exists_cached(db: Session, kind: str, stmt, entity_id: int) -> bool:
+    """Run an EXISTS statement, serving recent positive results from a TTL LRU."""
+    key = (db.get_bind().url, kind, entity_id)
+    now = monotonic()
+    expires_at = _exists_cache.get(key)
+    if expires_at is not None and expires_at > now:
+        _exists_cache.move_to_end(key)
+        return True
+    
+    found = bool(db.execute(stmt, {'entity_id': entity_id}).scalar())
+    if found:
+        _exists_cache[key] = now + EXISTS_CACHE_TTL
+        _exists_cache.move_to_end(key)
+        if len(_exists_cache) > EXISTS_CACHE_MAXSIZE:
+            _exists_cache.popitem(last=False)
+    return found
+
+
+def clear_exists_cache() -> None:
+    """Forget every remembered existence result (e.g. after the tables are recreated)."""
+    _exists_cache.clear()
+
+
+def member_exists(db: Session, member_id: int) -> bool:
+    """Return True if a member with this ID exists."""
+    return _exists_cached(db, 'member', _member_exists_stmt, member_id)
+
+
+def trainer_exists(db: Session, trainer_id: int) -> bool:
+    """Return True if a trainer with this ID exists."""
+    return _exists_cached(db, 'trainer', _trainer_exists_stmt, trainer_id)
+
+
+def room_exists(db: Session, room_id: int) -> bool:
+    """Return True if a room with this ID exists."""
+    return _exists_cached(db, 'room', _room_exists_stmt, room_id)
+
+
+def admin_exists(db: Session, admin_id: int) -> bool:
+    """Return True if an admin staff member with this ID exists."""
+    return _exists_cached(db, 'admin', _admin_exists_stmt, admin_id)
@@ -3,14 +3,55 @@ Member Functions Implementation
 """
 
 from sqlalchemy.orm import Session
+from sqlalchemy import select, exists, insert, literal, or_
 from sqlalchemy.exc import IntegrityError
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+import re
 from datetime import date, datetime
 from models import Member, HealthMetric, FitnessGoal, PersonalTrainingSession, Trainer, Room
 from typing import Optional, List
+from .existence import member_exists
+from .validation import violated_constraint
+from .timeslots import minutes_between, stored_duration_minutes
 
 
-def register_member(
-    db: Session,
+# Compiled once: one pass over the address, no intermediate list from split()
+_EMAIL_RE = re.compile(r'^[^@\s]+@[^@\s]+\.[^@\s]+\Z')
+
+# Allowed values; the tuples keep display order for error messages
+_MEMBERSHIP_STATUSES = ('Active', 'Inactive', 'Suspended', 'Cancelled')
+_GOAL_STATUSES = ('Active', 'Completed', 'Cancelled', 'On Hold')
+_SESSION_TYPES = ('Personal Training', 'Group Class')
+_VALID_MEMBERSHIP_STATUSES = frozenset(_MEMBERSHIP_STATUSES)
+_VALID_GOAL_STATUSES = frozenset(_GOAL_STATUSES)
+_VALID_SESSION_TYPES = frozenset(_SESSION_TYPES)
+_VALID_GENDERS = frozenset(('M', 'F', 'O'))
+
+# Constraint names reported by PostgreSQL for the violations we translate
+_MEMBER_EMAIL_CONSTRAINT = 'Member_Email_key'
+# Exclusion constraints that only fire when a concurrent booking won the race
+_OVERLAP_CONSTRAINTS = frozenset(('no_trainer_overlap', 'no_room_overlap'))
+
+
+def _validate_date_of_birth(date_of_birth: date, today: Optional[date] = None) -> None:
+    """Raise ValueError unless date_of_birth gives an age between 13 and 120."""
+    today = today or date.today()
+    if date_of_birth > today:
+        raise ValueError("Date of birth cannot be in the future.")
+    age = (today - date_of_birth).days // 365
+    if age > 120:
+        raise ValueError("Invalid date of birth (age exceeds reasonable limit).")
+    if age < 13:
+        raise ValueError("Member must be at least 13 years old.")
+
+
+def _validate_gender(gender: Optional[str]) -> None:
+    """Raise ValueError unless gender is 'M', 'F', 'O' or empty."""
+    if gender and gender.upper() not in _VALID_GENDERS:
+        raise ValueError("Gender must be 'M', 'F', 'O', or empty.")
+
+
+def _validate_member_fields(
     first_name: str,
     last_name: str,
     email: str,
@@ -18,15 +59,10 @@ def register_member(
     gender: Optional[str] = None,
     phone: Optional[str] = None,
     address: Optional[str] = None,
-    membership_status: str = 'Active'
-) -> Member:
-    """
-    User Registration
-    Create a new member with unique email and basic profile info.
-    
-    Returns: Created Member object
-    Raises: ValueError for validation errors, IntegrityError if email already exists
-    """
+    membership_status: str = 'Active',
+    today: Optional[date] = None
+) -> None:
+    """Validate registration input that does not need the database."""
     # Edge case: Validate required fields
     if not first_name or not first_name.strip():
         raise ValueError("First name is required and cannot be empty.")
@@ -36,7 +72,7 @@ def register_member(
         raise ValueError("Email is required and cannot be empty.")
     
     # Edge case: Validate email format (basic check)
-    if '@' not in email or '.' not in email.split('@')[-1]:
+    if not _EMAIL_RE.match(email.strip()):
         raise ValueError("Invalid email format.")
     
     # Edge case: Validate name length
@@ -49,57 +85,127 @@ def register_member(
     
     # Edge case: Validate date of birth (not in future, reasonable age)
     if date_of_birth:
-        if date_of_birth > date.today():
-            raise ValueError("Date of birth cannot be in the future.")
-        age = (date.today() - date_of_birth).days // 365
-        if age > 120:
-            raise ValueError("Invalid date of birth (age exceeds reasonable limit).")
-        if age < 13:
-            raise ValueError("Member must be at least 13 years old.")
+        _validate_date_of_birth(date_of_birth, today)
     
     # Edge case: Validate gender
-    if gender and gender.upper() not in ['M', 'F', 'O', '']:
-        raise ValueError("Gender must be 'M', 'F', 'O', or empty.")
+    _validate_gender(gender)
     
     # Edge case: Validate membership status
-    valid_statuses = ['Active', 'Inactive', 'Suspended', 'Cancelled']
-    if membership_status not in valid_statuses:
-        raise ValueError(f"Membership status must be one of: {valid_statuses}")
+    if membership_status not in _VALID_MEMBERSHIP_STATUSES:
+        raise ValueError(f"Membership status must be one of: {list(_MEMBERSHIP_STATUSES)}")
+
+
+def _member_values(
+    first_name: str,
+    last_name: str,
+    email: str,
+    date_of_birth: Optional[date] = None,
+    gender: Optional[str] = None,
+    phone: Optional[str] = None,
+    address: Optional[str] = None,
+    membership_status: str = 'Active',
+    today: Optional[date] = None
+) -> dict:
+    """Normalize validated registration input into Member column values."""
+    return {
+        'FirstName': first_name.strip(),
+        'LastName': last_name.strip(),
+        'Email': email.strip().lower(),
+        'DateOfBirth': date_of_birth,
+        'Gender': gender.upper() if gender else None,
+        'Phone': phone.strip() if phone else None,
+        'Address': address.strip() if address else None,
+        'JoinDate': today or date.today(),
+        'MembershipStatus': membership_status
+    }
+
+
+def register_member(
+    db: Session,
+    first_name: str,
+    last_name: str,
+    email: str,
+    date_of_birth: Optional[date] = None,
+    gender: Optional[str] = None,
+    phone: Optional[str] = None,
+    address: Optional[str] = None,
+    membership_status: str = 'Active'
+) -> Member:
+    """
+    User Registration
+    Create a new member with unique email and basic profile info.
     
-    # Edge case: Check if email already exists (before attempting insert)
-    existing = db.query(Member).filter(Member.Email == email).first()
-    if existing:
-        raise ValueError(f"Email '{email}' already exists. Registration failed.")
+    Returns: Created Member object
+    Raises: ValueError for validation errors or if email already exists
+    """
+    fields = dict(
+        first_name=first_name, last_name=last_name, email=email,
+        date_of_birth=date_of_birth, gender=gender, phone=phone,
+        address=address, membership_status=membership_status
+    )
+    today = date.today()
+    _validate_member_fields(**fields, today=today)
     
     try:
-        # Create new member using ORM
-        new_member = Member(
-            FirstName=first_name.strip(),
-            LastName=last_name.strip(),
-            Email=email.strip().lower(),
-            DateOfBirth=date_of_birth,
-            Gender=gender.upper() if gender else None,
-            Phone=phone.strip() if phone else None,
-            Address=address.strip() if address else None,
-            JoinDate=date.today(),
-            MembershipStatus=membership_status
-        )
+        # Create new member using ORM; duplicate emails are rejected by
+        # the UNIQUE constraint rather than a separate SELECT
+        new_member = Member(**_member_values(**fields, today=today))
         
         # Add to session and commit
         db.add(new_member)
         db.commit()
-        db.refresh(new_member)
         
         return new_member
     
     except IntegrityError as e:
         db.rollback()
-        raise ValueError(f"Email '{email}' already exists. Registration failed.") from e
+        constraint = violated_constraint(e)
+        if constraint == _MEMBER_EMAIL_CONSTRAINT:
+            raise ValueError(f"Email '{email}' already exists. Registration failed.") from e
+        raise ValueError(f"Registration failed: violates {constraint or 'a database constraint'}.") from e
     except Exception as e:
         db.rollback()
         raise ValueError(f"Registration failed: {str(e)}") from e
 
 
+def register_members_bulk(
+    db: Session,
+    members: List[dict]
+) -> List[int]:
+    """
+    User Registration - Bulk import
+    Register many members with one multi-row INSERT. Each dict takes
+    register_member()'s keyword arguments. Rows whose email is already
+    registered are skipped (ON CONFLICT DO NOTHING).
+    
+    Returns: IDs of the newly created members
+    """
+    if not members:
+        raise ValueError("At least one member must be provided.")
+    
+    today = date.today()
+    for position, row in enumerate(members, start=1):
+        try:
+            _validate_member_fields(**row, today=today)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Member #{position}: {e}") from e
+    
+    stmt = (
+        pg_insert(Member)
+        .values([_member_values(**row, today=today) for row in members])
+        .on_conflict_do_nothing(index_elements=[Member.Email])
+        .returning(Member.MemberID)
+    )
+    
+    try:
+        member_ids = db.scalars(stmt).all()
+        db.commit()
+        return member_ids
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Bulk registration failed: {str(e)}") from e
+
+
 def update_profile(
     db: Session,
     member_id: int,
@@ -122,8 +228,9 @@ def update_profile(
     if all(field is None for field in [first_name, last_name, phone, address, date_of_birth, gender]):
         raise ValueError("At least one field must be provided for update.")
     
-    # Query member using ORM
-    member = db.query(Member).filter(Member.MemberID == member_id).first()
+    # Primary-key lookup: served from the identity map when this session
+    # already holds the member (e.g. right after register_member)
+    member = db.get(Member, member_id)
     
     if not member:
         raise ValueError(f"Member with ID {member_id} not found.")
@@ -154,21 +261,15 @@ def update_profile(
         member.Address = address.strip() if address else None
     
     if date_of_birth is not None:
-        if date_of_birth > date.today():
-            raise ValueError("Date of birth cannot be in the future.")
-        age = (date.today() - date_of_birth).days // 365
-        if age > 120 or age < 13:
-            raise ValueError("Invalid date of birth.")
+        _validate_date_of_birth(date_of_birth)
         member.DateOfBirth = date_of_birth
     
     if gender is not None:
-        if gender and gender.upper() not in ['M', 'F', 'O', '']:
-            raise ValueError("Gender must be 'M', 'F', 'O', or empty.")
+        _validate_gender(gender)
         member.Gender = gender.upper() if gender else None
     
     try:
         db.commit()
-        db.refresh(member)
         return member
     except Exception as e:
         db.rollback()
@@ -211,20 +312,19 @@ def add_fitness_goal(
             raise ValueError("Target body fat percentage must be between 0 and 100.")
     
     # Edge case: Validate target_date
+    today = date.today()
     if target_date:
-        if target_date < date.today():
+        if target_date < today:
             raise ValueError("Target date cannot be in the past.")
-        if (target_date - date.today()).days > 3650:  # 10 years
+        if (target_date - today).days > 3650:  # 10 years
             raise ValueError("Target date is too far in the future.")
     
     # Edge case: Validate goal_status
-    valid_statuses = ['Active', 'Completed', 'Cancelled', 'On Hold']
-    if goal_status not in valid_statuses:
-        raise ValueError(f"Goal status must be one of: {valid_statuses}")
+    if goal_status not in _VALID_GOAL_STATUSES:
+        raise ValueError(f"Goal status must be one of: {list(_GOAL_STATUSES)}")
     
     # Verify member exists
-    member = db.query(Member).filter(Member.MemberID == member_id).first()
-    if not member:
+    if not member_exists(db, member_id):
         raise ValueError(f"Member with ID {member_id} not found.")
     
     # Edge case: Check if at least one target is set
@@ -238,7 +338,7 @@ def add_fitness_goal(
             GoalType=goal_type.strip(),
             TargetBodyWeight=target_body_weight,
             TargetBodyFatPercentage=target_body_fat,
-            SetDate=date.today(),
+            SetDate=today,
             TargetDate=target_date,
             GoalStatus=goal_status,
             Notes=notes.strip() if notes else None
@@ -246,7 +346,6 @@ def add_fitness_goal(
         
         db.add(new_goal)
         db.commit()
-        db.refresh(new_goal)
         
         return new_goal
     except Exception as e:
@@ -254,29 +353,26 @@ def add_fitness_goal(
         raise ValueError(f"Failed to add fitness goal: {str(e)}") from e
 
 
-def log_health_metric(
-    db: Session,
+def _validate_health_metric_fields(
     member_id: int,
     recorded_date: date,
     height: Optional[float] = None,
     weight: Optional[float] = None,
     body_fat_percentage: Optional[float] = None,
     resting_heart_rate: Optional[int] = None,
-    notes: Optional[str] = None
-) -> HealthMetric:
-    """
-    3.1.3 Health History
-    Log multiple metric entries; do not overwrite. Must support time-stamped entries.
-    Historical tracking - never UPDATE, only INSERT.
-    """
+    notes: Optional[str] = None,
+    today: Optional[date] = None
+) -> None:
+    """Validate health metric input that does not need the database."""
     # Edge case: Validate member_id
     if not isinstance(member_id, int) or member_id <= 0:
         raise ValueError("Member ID must be a positive integer.")
     
     # Edge case: Validate recorded_date
-    if recorded_date > date.today():
+    today = today or date.today()
+    if recorded_date > today:
         raise ValueError("Recorded date cannot be in the future.")
-    if (date.today() - recorded_date).days > 36500:  # 100 years
+    if (today - recorded_date).days > 36500:  # 100 years
         raise ValueError("Recorded date is too far in the past.")
     
     # Edge case: Validate at least one metric is provided
@@ -300,15 +396,32 @@ def log_health_metric(
         if body_fat_percentage < 0 or body_fat_percentage > 100:
             raise ValueError("Body fat percentage must be between 0 and 100.")
     
-    if resting_heart_rate is not None:
-        if resting_heart_rate <= 0:
-            raise ValueError("Resting heart rate must be positive.")
-        if resting_heart_rate < 30 or resting_heart_rate > 200:
-            raise ValueError("Resting heart rate must be between 30 and 200 bpm.")
+    if resting_heart_rate is not None and not 30 <= resting_heart_rate <= 200:
+        raise ValueError("Resting heart rate must be between 30 and 200 bpm.")
+
+
+def log_health_metric(
+    db: Session,
+    member_id: int,
+    recorded_date: date,
+    height: Optional[float] = None,
+    weight: Optional[float] = None,
+    body_fat_percentage: Optional[float] = None,
+    resting_heart_rate: Optional[int] = None,
+    notes: Optional[str] = None
+) -> HealthMetric:
+    """
+    3.1.3 Health History
+    Log multiple metric entries; do not overwrite. Must support time-stamped entries.
+    Historical tracking - never UPDATE, only INSERT.
+    """
+    _validate_health_metric_fields(
+        member_id, recorded_date, height, weight,
+        body_fat_percentage, resting_heart_rate, notes
+    )
     
     # Verify member exists
-    member = db.query(Member).filter(Member.MemberID == member_id).first()
-    if not member:
+    if not member_exists(db, member_id):
         raise ValueError(f"Member with ID {member_id} not found.")
     
     try:
@@ -325,7 +438,6 @@ def log_health_metric(
         
         db.add(new_metric)
         db.commit()
-        db.refresh(new_metric)
         
         return new_metric
     except Exception as e:
@@ -359,9 +471,10 @@ def schedule_pt_session(
         raise ValueError("Room ID must be a positive integer if provided.")
     
     # Edge case: Validate session_date
-    if session_date < date.today():
+    today = date.today()
+    if session_date < today:
         raise ValueError("Session date cannot be in the past.")
-    if (session_date - date.today()).days > 365:
+    if (session_date - today).days > 365:
         raise ValueError("Session date cannot be more than 1 year in the future.")
     
     # Edge case: Validate time range
@@ -369,114 +482,201 @@ def schedule_pt_session(
         raise ValueError("Start time must be before end time.")
     
     # Edge case: Validate session duration (reasonable limits)
-    time_diff = datetime.combine(date.today(), end_time) - datetime.combine(date.today(), start_time)
-    duration_mins = time_diff.total_seconds() / 60
+    duration_mins = minutes_between(start_time, end_time)
     if duration_mins < 15:
         raise ValueError("Session duration must be at least 15 minutes.")
     if duration_mins > 480:  # 8 hours
         raise ValueError("Session duration cannot exceed 8 hours.")
     
     # Edge case: Validate session_type
-    valid_types = ['Personal Training', 'Group Class']
-    if session_type not in valid_types:
-        raise ValueError(f"Session type must be one of: {valid_types}")
-    
-    # Edge case: Validate max_capacity for group classes
-    if session_type == 'Group Class':
-        if max_capacity is None or max_capacity <= 0:
-            raise ValueError("Group classes must have a positive max capacity.")
+    if session_type not in _VALID_SESSION_TYPES:
+        raise ValueError(f"Session type must be one of: {list(_SESSION_TYPES)}")
+    
+    # Edge case: Validate max_capacity (ck_session_max_capacity applies to every session type)
+    if session_type == 'Group Class' and (max_capacity is None or max_capacity <= 0):
+        raise ValueError("Group classes must have a positive max capacity.")
+    if max_capacity is not None:
+        if max_capacity <= 0:
+            raise ValueError("Max capacity must be positive if provided.")
         if max_capacity > 100:
             raise ValueError("Max capacity cannot exceed 100.")
     
-    # Verify entities exist
-    member = db.query(Member).filter(Member.MemberID == member_id).first()
-    if not member:
+    # Verify entities exist (one round-trip for member, trainer and room)
+    if room_id:
+        room_exists = exists().where(Room.RoomID == room_id)
+        room_capacity = select(Room.RoomCapacity).where(Room.RoomID == room_id).scalar_subquery()
+    else:
+        room_exists, room_capacity = literal(True), literal(None)
+    found = db.execute(
+        select(
+            exists().where(Member.MemberID == member_id).label('member'),
+            exists().where(Trainer.TrainerID == trainer_id).label('trainer'),
+            room_exists.label('room'),
+            room_capacity.label('room_capacity')
+        )
+    ).one()
+    
+    if not found.member:
         raise ValueError(f"Member with ID {member_id} not found.")
     
-    trainer = db.query(Trainer).filter(Trainer.TrainerID == trainer_id).first()
-    if not trainer:
+    if not found.trainer:
         raise ValueError(f"Trainer with ID {trainer_id} not found.")
     
     if room_id:
-        room = db.query(Room).filter(Room.RoomID == room_id).first()
-        if not room:
+        if not found.room:
             raise ValueError(f"Room with ID {room_id} not found.")
         
         # Edge case: Validate room capacity for group classes
-        if session_type == 'Group Class' and max_capacity and room.RoomCapacity:
-            if max_capacity > room.RoomCapacity:
-                raise ValueError(f"Max capacity ({max_capacity}) exceeds room capacity ({room.RoomCapacity}).")
+        if session_type == 'Group Class' and max_capacity and found.room_capacity:
+            if max_capacity > found.room_capacity:
+                raise ValueError(f"Max capacity ({max_capacity}) exceeds room capacity ({found.room_capacity}).")
     
-    # Check for trainer availability conflicts (using ORM query)
-    conflicting_sessions = db.query(PersonalTrainingSession).filter(
+    # Sessions overlapping this slot for the same trainer, member or room
+    parties = [
         PersonalTrainingSession.TrainerID == trainer_id,
+        PersonalTrainingSession.MemberID == member_id
+    ]
+    if room_id:
+        parties.append(PersonalTrainingSession.RoomID == room_id)
+    overlap_criteria = (
         PersonalTrainingSession.SessionDate == session_date,
         PersonalTrainingSession.StartTime < end_time,
-        PersonalTrainingSession.EndTime > start_time
-    ).first()
-    
-    if conflicting_sessions:
-        raise ValueError(
-            f"Trainer has a conflicting session (ID: {conflicting_sessions.SessionID}) "
-            f"from {conflicting_sessions.StartTime} to {conflicting_sessions.EndTime}."
+        PersonalTrainingSession.EndTime > start_time,
+        or_(*parties)
+    )
+    
+    # Edge case: DurationMinutes is generated from the times; an explicit value must agree
+    if duration_minutes is not None and duration_minutes != stored_duration_minutes(start_time, end_time):
+        raise ValueError("Duration minutes must match the session start and end times.")
+    
+    values = {
+        PersonalTrainingSession.MemberID: member_id,
+        PersonalTrainingSession.TrainerID: trainer_id,
+        PersonalTrainingSession.RoomID: room_id,
+        PersonalTrainingSession.SessionDate: session_date,
+        PersonalTrainingSession.StartTime: start_time,
+        PersonalTrainingSession.EndTime: end_time,
+        PersonalTrainingSession.SessionType: session_type,
+        PersonalTrainingSession.MaxCapacity: max_capacity,
+        PersonalTrainingSession.CurrentEnrollment: 0,
+        PersonalTrainingSession.Notes: notes.strip() if notes else None
+    }
+    
+    # Conflict check and insert in one statement:
+    # INSERT ... SELECT <values> WHERE NOT EXISTS (<overlapping session>)
+    stmt = insert(PersonalTrainingSession).from_select(
+        list(values),
+        select(*[literal(value, column.type) for column, value in values.items()]).where(
+            ~exists().where(*overlap_criteria)
         )
+    ).returning(PersonalTrainingSession)
+    
+    try:
+        new_session = db.scalars(stmt).first()
+        if new_session:
+            db.commit()
+            return new_session
+    except IntegrityError as e:
+        db.rollback()
+        # Only the overlap exclusion constraints mean a concurrent booking won
+        # the race; report those like any other conflict below
+        constraint = violated_constraint(e)
+        if constraint not in _OVERLAP_CONSTRAINTS:
+            raise ValueError(f"Failed to schedule session: violates {constraint or 'a database constraint'}.") from e
+    except Exception as e:
+        db.rollback()
+        raise ValueError(f"Failed to schedule session: {str(e)}") from e
+    
+    # Nothing inserted: classify the conflicting sessions for the error message
+    overlapping = db.query(
+        PersonalTrainingSession.SessionID,
+        PersonalTrainingSession.TrainerID,
+        PersonalTrainingSession.MemberID,
+        PersonalTrainingSession.RoomID,
+        PersonalTrainingSession.StartTime,
+        PersonalTrainingSession.EndTime
+    ).filter(*overlap_criteria).order_by(PersonalTrainingSession.StartTime).all()
+    
+    # Check for trainer availability conflicts
+    for conflict in overlapping:
+        if conflict.TrainerID == trainer_id:
+            raise ValueError(
+                f"Trainer has a conflicting session (ID: {conflict.SessionID}) "
+                f"from {conflict.StartTime} to {conflict.EndTime}."
+            )
     
     # Check for room conflicts if room is specified
-    if room_id:
-        conflicting_room = db.query(PersonalTrainingSession).filter(
-            PersonalTrainingSession.RoomID == room_id,
-            PersonalTrainingSession.SessionDate == session_date,
-            PersonalTrainingSession.StartTime < end_time,
-            PersonalTrainingSession.EndTime > start_time
-        ).first()
-        
-        if conflicting_room:
+    for conflict in overlapping:
+        if room_id and conflict.RoomID == room_id:
             raise ValueError(
-                f"Room is already booked for session {conflicting_room.SessionID} "
-                f"from {conflicting_room.StartTime} to {conflicting_room.EndTime}."
+                f"Room is already booked for session {conflict.SessionID} "
+                f"from {conflict.StartTime} to {conflict.EndTime}."
             )
     
     # Edge case: Check if member already has a session at this time
-    member_conflict = db.query(PersonalTrainingSession).filter(
-        PersonalTrainingSession.MemberID == member_id,
-        PersonalTrainingSession.SessionDate == session_date,
-        PersonalTrainingSession.StartTime < end_time,
-        PersonalTrainingSession.EndTime > start_time
-    ).first()
+    for conflict in overlapping:
+        if conflict.MemberID == member_id:
+            raise ValueError(
+                f"Member already has a session scheduled at this time "
+                f"(Session ID: {conflict.SessionID})."
+            )
     
-    if member_conflict:
-        raise ValueError(
-            f"Member already has a session scheduled at this time "
-            f"(Session ID: {member_conflict.SessionID})."
-        )
+    # The conflicting session was removed between the two statements
+    raise ValueError("Failed to schedule session: time slot changed concurrently, please retry.")
+
+
+def log_health_metrics_bulk(
+    db: Session,
+    metrics: List[dict]
+) -> List[int]:
+    """
+    3.1.3 Health History - Bulk import
+    Batch variant of log_health_metric() for importers: each dict takes its keyword
+    arguments. All rows are validated, members are checked with one IN query, and
+    the batch is inserted in one statement with a single commit.
+    
+    Returns: IDs of the created health metric entries, in input order
+    """
+    if not metrics:
+        raise ValueError("At least one health metric must be provided.")
+    
+    today = date.today()
+    for position, row in enumerate(metrics, start=1):
+        try:
+            _validate_health_metric_fields(**row, today=today)
+        except (TypeError, ValueError) as e:
+            raise ValueError(f"Health metric #{position}: {e}") from e
+    
+    # Verify all members exist with one IN query
+    member_ids = {row['member_id'] for row in metrics}
+    found_members = set(db.execute(
+        select(Member.MemberID).where(Member.MemberID.in_(member_ids))
+    ).scalars())
+    missing_members = member_ids - found_members
+    if missing_members:
+        raise ValueError(f"Member with ID {min(missing_members)} not found.")
+    
+    rows = [
+        {
+            'MemberID': row['member_id'],
+            'RecordedDate': row['recorded_date'],
+            'Height': row.get('height'),
+            'Weight': row.get('weight'),
+            'BodyFatPercentage': row.get('body_fat_percentage'),
+            'RestingHeartRate': row.get('resting_heart_rate'),
+            'Notes': row['notes'].strip() if row.get('notes') else None
+        }
+        for row in metrics
+    ]
     
     try:
-        # Calculate duration if not provided
-        if duration_minutes is None:
-            time_diff = datetime.combine(date.today(), end_time) - datetime.combine(date.today(), start_time)
-            duration_minutes = int(time_diff.total_seconds() / 60)
-        
-        # Create new session using ORM
-        new_session = PersonalTrainingSession(
-            MemberID=member_id,
-            TrainerID=trainer_id,
-            RoomID=room_id,
-            SessionDate=session_date,
-            StartTime=start_time,
-            EndTime=end_time,
-            DurationMinutes=duration_minutes,
-            SessionType=session_type,
-            MaxCapacity=max_capacity,
-            CurrentEnrollment=0,
-            Notes=notes.strip() if notes else None
-        )
-        
-        db.add(new_session)
+        # Single multi-row INSERT ... RETURNING (never UPDATE to preserve history)
+        metric_ids = db.scalars(
+            insert(HealthMetric).returning(HealthMetric.HealthMetricID, sort_by_parameter_order=True),
+            rows
+        ).all()
         db.commit()
-        db.refresh(new_session)
-        
-        return new_session
+        return metric_ids
     except Exception as e:
         db.rollback()
-        raise ValueError(f"Failed to schedule session: {str(e)}") from e
-
+        raise ValueError(f"Failed to log health metrics: {str(e)}") from e
@@ -0,0 +1,16 @@
+"""
+Time Slot Helpers Shared by the Member and Trainer Functions
+"""
+
+from datetime import time
+
+
+def minutes_between(start_time: time, end_time: time) -> float:
+    """Minutes from start_time to end_time on the same day, straight from the time fields."""
+    return ((end_time.hour * 60 + end_time.minute) - (start_time.hour * 60 + start_time.minute)
+            + (end_time.second - start_time.second) / 60)
+
+
+def stored_duration_minutes(start_time: time, end_time: time) -> int:
+    """Minutes as the DurationMinutes generated column stores them: ::int rounds halves up."""
+    return int(minutes_between(start_time, end_time) + 0.5)
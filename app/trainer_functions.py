@@ -2,11 +2,13 @@
 Trainer Functions Implementation
 """
 
-from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy import select, or_, and_, true, bindparam, Date
 from datetime import date, datetime
-from models import Trainer, PersonalTrainingSession, Member, FitnessGoal, HealthMetric
-from typing import List, Optional
+from models import PersonalTrainingSession, Member, FitnessGoal, HealthMetric
+from typing import Iterator, List, Optional
+from .existence import trainer_exists
+from .timeslots import minutes_between
 
 
 def set_availability(
@@ -26,9 +28,10 @@ def set_availability(
         raise ValueError("Trainer ID must be a positive integer.")
     
     # Edge case: Validate session_date
-    if session_date < date.today():
+    today = date.today()
+    if session_date < today:
         raise ValueError("Availability date cannot be in the past.")
-    if (session_date - date.today()).days > 365:
+    if (session_date - today).days > 365:
         raise ValueError("Availability date cannot be more than 1 year in the future.")
     
     # Edge case: Validate time range
@@ -36,16 +39,14 @@ def set_availability(
         raise ValueError("Start time must be before end time.")
     
     # Edge case: Validate duration (reasonable limits)
-    time_diff = datetime.combine(date.today(), end_time) - datetime.combine(date.today(), start_time)
-    duration_mins = time_diff.total_seconds() / 60
+    duration_mins = minutes_between(start_time, end_time)
     if duration_mins < 15:
         raise ValueError("Availability slot must be at least 15 minutes.")
     if duration_mins > 1440:  # 24 hours
         raise ValueError("Availability slot cannot exceed 24 hours.")
     
     # Verify trainer exists
-    trainer = db.query(Trainer).filter(Trainer.TrainerID == trainer_id).first()
-    if not trainer:
+    if not trainer_exists(db, trainer_id):
         raise ValueError(f"Trainer with ID {trainer_id} not found.")
     
     # Check for overlapping sessions using ORM query
@@ -72,47 +73,90 @@ def set_availability(
     }
 
 
-def view_schedule(
-    db: Session,
-    trainer_id: int,
-    from_date: Optional[date] = None
-) -> List[PersonalTrainingSession]:
-    """
-    Schedule View
-    See assigned PT sessions and classes.
-    """
+def _schedule_query(db: Session, trainer_id: int, from_date: Optional[date] = None):
+    """Validate schedule arguments and build the trainer's upcoming-sessions SELECT."""
     # Edge case: Validate trainer_id
     if not isinstance(trainer_id, int) or trainer_id <= 0:
         raise ValueError("Trainer ID must be a positive integer.")
     
     # Edge case: Validate from_date if provided
+    today = date.today()
     if from_date and from_date < date(1900, 1, 1):
         raise ValueError("Date cannot be before 1900.")
-    if from_date and (from_date - date.today()).days > 3650:
+    if from_date and (from_date - today).days > 3650:
         raise ValueError("Date cannot be more than 10 years in the future.")
     
     # Verify trainer exists
-    trainer = db.query(Trainer).filter(Trainer.TrainerID == trainer_id).first()
-    if not trainer:
+    if not trainer_exists(db, trainer_id):
         raise ValueError(f"Trainer with ID {trainer_id} not found.")
     
-    # Query sessions using ORM with eager loading
-    query = db.query(PersonalTrainingSession).filter(
-        PersonalTrainingSession.TrainerID == trainer_id
-    )
-    
-    if from_date:
-        query = query.filter(PersonalTrainingSession.SessionDate >= from_date)
-    else:
-        query = query.filter(PersonalTrainingSession.SessionDate >= date.today())
-    
-    # Use joined loading to avoid N+1 queries
-    sessions = query.order_by(
+    # Related rows are batch-loaded with one SELECT ... IN per relationship
+    # instead of joining them onto every row.
+    return select(PersonalTrainingSession).options(
+        selectinload(PersonalTrainingSession.member),
+        selectinload(PersonalTrainingSession.trainer),
+        selectinload(PersonalTrainingSession.room)
+    ).where(
+        PersonalTrainingSession.TrainerID == trainer_id,
+        # Rendered inline so the planner can match idx_session_upcoming's
+        # literal cutoff even under a generic prepared plan
+        PersonalTrainingSession.SessionDate >= bindparam(
+            'from_date', from_date or today, type_=Date, literal_execute=True
+        )
+    ).order_by(
         PersonalTrainingSession.SessionDate,
         PersonalTrainingSession.StartTime
-    ).all()
-    
-    return sessions
+    )
+
+
+def iter_schedule(
+    db: Session,
+    trainer_id: int,
+    from_date: Optional[date] = None,
+    batch_size: int = 64
+) -> Iterator[PersonalTrainingSession]:
+    """
+    Schedule Stream
+    Same sessions as view_schedule, fetched batch_size rows at a time from a
+    server-side cursor so long schedules never sit in memory all at once.
+    Arguments are validated up front, before the first row is requested.
+    """
+    stmt = _schedule_query(db, trainer_id, from_date)
+    return iter(db.scalars(stmt.execution_options(yield_per=batch_size)))
+
+
+def view_schedule(
+    db: Session,
+    trainer_id: int,
+    from_date: Optional[date] = None
+) -> List[PersonalTrainingSession]:
+    """
+    Schedule View
+    See assigned PT sessions and classes.
+    """
+    return db.scalars(_schedule_query(db, trainer_id, from_date)).all()
+
+
+# Columns returned by lookup_member for each member, latest goal and latest metric
+_MEMBER_COLUMNS = (
+    Member.MemberID, Member.FirstName, Member.LastName,
+    Member.Email, Member.Phone, Member.MembershipStatus
+)
+_GOAL_COLUMNS = (
+    FitnessGoal.GoalID, FitnessGoal.GoalType, FitnessGoal.TargetBodyWeight,
+    FitnessGoal.TargetBodyFatPercentage, FitnessGoal.TargetDate, FitnessGoal.GoalStatus
+)
+_METRIC_COLUMNS = (
+    HealthMetric.HealthMetricID, HealthMetric.RecordedDate, HealthMetric.Height,
+    HealthMetric.Weight, HealthMetric.BodyFatPercentage, HealthMetric.RestingHeartRate
+)
+_LIKE_ESCAPE = '\\'
+
+
+def _contains_pattern(term: str) -> str:
+    """Build an ILIKE 'contains' pattern that matches term literally."""
+    escaped = term.replace(_LIKE_ESCAPE, _LIKE_ESCAPE * 2).replace('%', _LIKE_ESCAPE + '%').replace('_', _LIKE_ESCAPE + '_')
+    return f"%{escaped}%"
 
 
 def lookup_member(
@@ -123,6 +167,8 @@ def lookup_member(
     Member Lookup
     Search by name (case-insensitive) and view current goal and last metric. No editing rights.
     Supports searching by first name, last name, or full name.
+    Returns: One dict per member with 'member', 'latest_goal' and 'latest_metric'
+    dicts (the latter two None when absent)
     """
     # Edge case: Validate search_term
     if not search_term or not search_term.strip():
@@ -132,70 +178,71 @@ def lookup_member(
     if len(search_term) > 100:
         raise ValueError("Search term cannot exceed 100 characters.")
     
-    # Edge case: Prevent SQL injection-like patterns (basic sanitization)
-    # Allow % and _ for LIKE patterns, but sanitize other dangerous chars
+    # Case-insensitive search using ORM. ilike() binds the term as a parameter,
+    # so only the LIKE wildcards need escaping: a literal % or _ matches itself.
     search_term_clean = search_term.strip()
-    search_term_clean = search_term_clean.replace(';', '').replace('--', '').replace('/*', '').replace('*/', '')
-    
-    # Case-insensitive search using ORM
-    search_pattern = f"%{search_term_clean}%"
+    search_pattern = _contains_pattern(search_term_clean)
     
     # Split search term to check if it's a full name (e.g., "John Doe")
     search_parts = search_term_clean.split()
     
     if len(search_parts) >= 2:
         # Full name search: match "FirstName LastName" or "LastName FirstName"
-        first_part = f"%{search_parts[0]}%"
-        last_part = f"%{search_parts[-1]}%"
-        members = db.query(Member).filter(
-            or_(
-                # Match first name with first part and last name with last part
-                and_(
-                    Member.FirstName.ilike(first_part),
-                    Member.LastName.ilike(last_part)
-                ),
-                # Match last name with first part and first name with last part (reversed)
-                and_(
-                    Member.LastName.ilike(first_part),
-                    Member.FirstName.ilike(last_part)
-                ),
-                # Also match if either name contains the full search term
-                Member.FirstName.ilike(search_pattern),
-                Member.LastName.ilike(search_pattern),
-                # Match concatenated full name
-                (Member.FirstName + ' ' + Member.LastName).ilike(search_pattern)
-            )
-        ).limit(100).all()
+        first_part = _contains_pattern(search_parts[0])
+        last_part = _contains_pattern(search_parts[-1])
+        member_filter = or_(
+            # Match first name with first part and last name with last part
+            and_(
+                Member.FirstName.ilike(first_part, escape=_LIKE_ESCAPE),
+                Member.LastName.ilike(last_part, escape=_LIKE_ESCAPE)
+            ),
+            # Match last name with first part and first name with last part (reversed)
+            and_(
+                Member.LastName.ilike(first_part, escape=_LIKE_ESCAPE),
+                Member.FirstName.ilike(last_part, escape=_LIKE_ESCAPE)
+            ),
+            # Also match if either name contains the full search term
+            Member.FirstName.ilike(search_pattern, escape=_LIKE_ESCAPE),
+            Member.LastName.ilike(search_pattern, escape=_LIKE_ESCAPE),
+            # Match full name (generated column with a trigram index)
+            Member.FullName.ilike(search_pattern, escape=_LIKE_ESCAPE)
+        )
     else:
         # Single word search: match first name or last name
-        members = db.query(Member).filter(
-            or_(
-                Member.FirstName.ilike(search_pattern),
-                Member.LastName.ilike(search_pattern)
-            )
-        ).limit(100).all()
-    
-    if not members:
-        return []
-    
-    # Build result with latest goal and metric
-    results = []
-    for member in members:
-        # Get latest fitness goal using ORM
-        latest_goal = db.query(FitnessGoal).filter(
-            FitnessGoal.MemberID == member.MemberID
-        ).order_by(FitnessGoal.SetDate.desc()).first()
-        
-        # Get latest health metric using ORM
-        latest_metric = db.query(HealthMetric).filter(
-            HealthMetric.MemberID == member.MemberID
-        ).order_by(HealthMetric.RecordedDate.desc()).first()
-        
-        results.append({
-            'member': member,
-            'latest_goal': latest_goal,
-            'latest_metric': latest_metric
-        })
-    
-    return results
-
+        member_filter = or_(
+            Member.FirstName.ilike(search_pattern, escape=_LIKE_ESCAPE),
+            Member.LastName.ilike(search_pattern, escape=_LIKE_ESCAPE)
+        )
+    
+    # Fetch each member with their latest goal and metric in one query.
+    # The LATERAL subqueries pick one row per member using the
+    # (MemberID, date DESC) indexes instead of two queries per member.
+    # Only the displayed columns are selected; rows become plain dicts.
+    goal_subquery = select(*_GOAL_COLUMNS).where(
+        FitnessGoal.MemberID == Member.MemberID
+    ).order_by(FitnessGoal.SetDate.desc()).limit(1).lateral()
+    metric_subquery = select(*_METRIC_COLUMNS).where(
+        HealthMetric.MemberID == Member.MemberID
+    ).order_by(HealthMetric.RecordedDate.desc()).limit(1).lateral()
+    
+    rows = db.execute(
+        select(*_MEMBER_COLUMNS, *goal_subquery.c, *metric_subquery.c)
+        .select_from(Member)
+        .outerjoin(goal_subquery, true())
+        .outerjoin(metric_subquery, true())
+        .where(member_filter)
+        .limit(100)
+    ).mappings()
+    
+    return [
+        {
+            'member': {column.key: row[column.key] for column in _MEMBER_COLUMNS},
+            'latest_goal': {
+                column.key: row[column.key] for column in _GOAL_COLUMNS
+            } if row['GoalID'] is not None else None,
+            'latest_metric': {
+                column.key: row[column.key] for column in _METRIC_COLUMNS
+            } if row['HealthMetricID'] is not None else None
+        }
+        for row in rows
+    ]
@@ -0,0 +1,28 @@
+"""
+Validation and Error Helpers Shared by the Member, Trainer and Admin Functions
+"""
+
+from typing import Optional
+from sqlalchemy.exc import IntegrityError
+
+
+def violated_constraint(error: IntegrityError) -> Optional[str]:
+    """Return the name of the constraint behind an IntegrityError, if the driver reports it."""
+    diag = getattr(error.orig, 'diag', None)
+    return getattr(diag, 'constraint_name', None)
+
+
+# ID type guards sit under `if __debug__:` at each call site. Callers behind a
+# typed request layer can run with `python -O`, which strips them entirely.
+def validate_id(value, label: str) -> None:
+    """Raise ValueError unless value is a positive integer ID."""
+    if not isinstance(value, int) or value <= 0:
+        raise ValueError(f"{label} must be a positive integer.")
+
+
+def validate_text(value: Optional[str], label: str, max_length: int, required: bool = False) -> None:
+    """Raise ValueError if a required text field is blank or any text field is too long."""
+    if required and (not value or not value.strip()):
+        raise ValueError(f"{label} is required and cannot be empty.")
+    if value and len(value) > max_length:
+        raise ValueError(f"{label} cannot exceed {max_length} characters.")
@@ -3,19 +3,48 @@ Command Line Interface for Gym Management System
 Provides role-based menus for Member, Trainer, and Admin functions
 """
 
-from datetime import date, datetime
+import re
+import threading
+from datetime import date, datetime, time
 from database import SessionLocal, init_db
-from app.member_functions import (
-    register_member, update_profile, add_fitness_goal,
-    log_health_metric, schedule_pt_session
-)
-from app.trainer_functions import set_availability, view_schedule, lookup_member
-from app.admin_functions import (
-    assign_room_booking, log_maintenance_issue, update_maintenance_status,
-    create_invoice, record_payment
-)
 from sqlalchemy.orm import Session
 
+try:
+    import readline  # noqa: F401 - line editing and history for input() where available
+except ImportError:
+    pass
+
+
+# Digits plus the formatting characters ( ) - and space, with at least one digit
+_PHONE_RE = re.compile(r'[()\- ]*\d[\d()\- ]*')
+
+# Fast paths for the fixed YYYY-MM-DD and HH:MM prompt formats
+_ISO_DATE_RE = re.compile(r'(\d{4})-(\d{1,2})-(\d{1,2})')
+_HOUR_MINUTE_RE = re.compile(r'(\d{1,2}):(\d{2})')
+
+
+def parse_date(value: str) -> date:
+    """Parse YYYY-MM-DD; other inputs fall back to strptime for its ValueError."""
+    match = _ISO_DATE_RE.fullmatch(value)
+    if match:
+        return date(int(match[1]), int(match[2]), int(match[3]))
+    return datetime.strptime(value, "%Y-%m-%d").date()
+
+
+def parse_time(value: str) -> time:
+    """Parse HH:MM; other inputs fall back to strptime for its ValueError."""
+    match = _HOUR_MINUTE_RE.fullmatch(value)
+    if match:
+        return time(int(match[1]), int(match[2]))
+    return datetime.strptime(value, "%H:%M").time()
+
+
+# get_input() converters keyed by requested type; other types are called directly
+_PARSERS = {
+    date: parse_date,
+    time: parse_time
+}
+
 
 def print_header(title):
     """Print formatted header"""
@@ -24,8 +53,18 @@ def print_header(title):
     print("="*60)
 
 
+def print_error(db: Session, error):
+    """
+    Print a failed operation and discard its session state, expiring
+    objects it may have left half-modified.
+    """
+    db.rollback()
+    print(f"\n[ERROR] Error: {error}")
+
+
 def get_input(prompt, input_type=str, default=None, allow_empty=False):
     """Get user input with type conversion"""
+    parse = _PARSERS.get(input_type, input_type)
     while True:
         try:
             value = input(f"{prompt}: ").strip()
@@ -36,7 +75,7 @@ def get_input(prompt, input_type=str, default=None, allow_empty=False):
                     return None
                 print("This field cannot be empty. Please enter a value.")
                 continue
-            return input_type(value)
+            return parse(value)
         except ValueError:
             print(f"Invalid input. Please enter a valid {input_type.__name__}.")
         except KeyboardInterrupt:
@@ -55,7 +94,7 @@ def get_date_input(prompt, allow_empty=True):
                 print("Date is required. Please enter a date.")
                 continue
             # Parse date
-            date_obj = datetime.strptime(value, "%Y-%m-%d").date()
+            date_obj = parse_date(value)
             return date_obj
         except ValueError:
             print("Invalid date format. Please use YYYY-MM-DD (e.g., 1990-05-15)")
@@ -74,10 +113,8 @@ def get_phone_input(prompt, allow_empty=True):
                     return None
                 print("Phone number is required. Please enter a phone number.")
                 continue
-            # Remove common formatting characters for storage
-            cleaned = value.replace("(", "").replace(")", "").replace("-", "").replace(" ", "")
-            # Basic validation - should contain only digits
-            if not cleaned.isdigit():
+            # Basic validation - only digits and common formatting characters
+            if not _PHONE_RE.fullmatch(value):
                 print("Phone number should contain only digits and formatting characters.")
                 continue
             # Return original formatted value (or cleaned if preferred)
@@ -87,6 +124,327 @@ def get_phone_input(prompt, allow_empty=True):
             return None
 
 
+# Each role module is imported inside its action helpers, so it still loads
+# only when the first action of that role runs (cached in sys.modules after).
+
+def _member_register(db: Session):
+    """Register a new member"""
+    from app.member_functions import register_member
+    
+    print_header("User Registration")
+    try:
+        member = register_member(
+            db,
+            first_name=get_input("First Name", allow_empty=False),
+            last_name=get_input("Last Name", allow_empty=False),
+            email=get_input("Email", allow_empty=False),
+            date_of_birth=get_date_input("Date of Birth"),
+            gender=get_input("Gender (M/F/O)", str, allow_empty=True) or None,
+            phone=get_phone_input("Phone Number"),
+            address=get_input("Address", str, allow_empty=True) or None
+        )
+        print(f"\n[OK] Successfully registered: {member.FirstName} {member.LastName} (ID: {member.MemberID})")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _member_update_profile(db: Session):
+    """Update a member's profile"""
+    from app.member_functions import update_profile
+    
+    print_header("Update Profile")
+    member_id = get_input("Member ID", int)
+    try:
+        member = update_profile(
+            db,
+            member_id,
+            first_name=get_input("First Name (leave empty to skip)", str, allow_empty=True) or None,
+            last_name=get_input("Last Name (leave empty to skip)", str, allow_empty=True) or None,
+            phone=get_phone_input("Phone Number (leave empty to skip)"),
+            address=get_input("Address (leave empty to skip)", str, allow_empty=True) or None
+        )
+        print(f"\n[OK] Profile updated: {member.FirstName} {member.LastName}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _member_add_goal(db: Session):
+    """Add a fitness goal for a member"""
+    from app.member_functions import add_fitness_goal
+    
+    print_header("Add Fitness Goal")
+    member_id = get_input("Member ID", int)
+    try:
+        goal = add_fitness_goal(
+            db,
+            member_id,
+            goal_type=get_input("Goal Type", allow_empty=False),
+            target_body_weight=get_input("Target Body Weight", float, allow_empty=True) or None,
+            target_body_fat=get_input("Target Body Fat %", float, allow_empty=True) or None,
+            target_date=get_date_input("Target Date")
+        )
+        print(f"\n[OK] Goal added: {goal.GoalType}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _member_log_metric(db: Session):
+    """Log today's health metric for a member"""
+    from app.member_functions import log_health_metric
+    
+    print_header("Log Health Metric")
+    member_id = get_input("Member ID", int)
+    try:
+        metric = log_health_metric(
+            db,
+            member_id,
+            recorded_date=date.today(),
+            weight=get_input("Weight", float) or None,
+            height=get_input("Height", float) or None,
+            body_fat_percentage=get_input("Body Fat %", float) or None,
+            resting_heart_rate=get_input("Resting Heart Rate", int) or None
+        )
+        print(f"\n[OK] Health metric logged for date: {metric.RecordedDate}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _member_schedule_session(db: Session):
+    """Schedule a personal training session"""
+    from app.member_functions import schedule_pt_session
+    
+    print_header("Schedule PT Session")
+    member_id = get_input("Member ID", int)
+    trainer_id = get_input("Trainer ID", int)
+    room_id = get_input("Room ID (leave empty if none)", int, allow_empty=True) or None
+    session_date = get_date_input("Session Date", allow_empty=False)
+    start = get_input("Start Time (HH:MM, e.g., 10:30)", time, allow_empty=False)
+    end = get_input("End Time (HH:MM, e.g., 11:30)", time, allow_empty=False)
+    
+    try:
+        session = schedule_pt_session(
+            db,
+            member_id,
+            trainer_id,
+            session_date,
+            start,
+            end,
+            room_id=room_id
+        )
+        print(f"\n[OK] Session scheduled: Session ID {session.SessionID}")
+    except ValueError as e:
+        print_error(db, e)
+    except Exception as e:
+        print_error(db, e)
+
+
+_MEMBER_ACTIONS = {
+    1: _member_register,
+    2: _member_update_profile,
+    3: _member_add_goal,
+    4: _member_log_metric,
+    5: _member_schedule_session,
+}
+
+
+def _trainer_set_availability(db: Session):
+    """Set a trainer's availability window"""
+    from app.trainer_functions import set_availability
+    
+    print_header("Set Availability")
+    trainer_id = get_input("Trainer ID", int)
+    date_obj = get_input("Date (YYYY-MM-DD)", date)
+    start = get_input("Start Time (HH:MM)", time)
+    end = get_input("End Time (HH:MM)", time)
+    
+    try:
+        result = set_availability(db, trainer_id, date_obj, start, end)
+        print(f"\n[OK] {result['message']}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _trainer_view_schedule(db: Session):
+    """Show a trainer's upcoming sessions"""
+    from app.trainer_functions import iter_schedule
+    
+    print_header("View Schedule")
+    trainer_id = get_input("Trainer ID", int)
+    try:
+        # Rows are printed as they stream in, so the total comes last
+        count = 0
+        for s in iter_schedule(db, trainer_id):
+            if count == 0:
+                print("\nUpcoming sessions:")
+            print(f"  - {s.SessionDate} {s.StartTime}-{s.EndTime}: {s.SessionType}")
+            count += 1
+        if count:
+            print(f"\nFound {count} upcoming sessions.")
+        else:
+            print("\nNo upcoming sessions found.")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _trainer_lookup_member(db: Session):
+    """Search members by name"""
+    from app.trainer_functions import lookup_member
+    
+    print_header("Member Lookup")
+    search_term = get_input("Search by name (first name, last name, or full name)", allow_empty=False)
+    try:
+        results = lookup_member(db, search_term)
+        if results:
+            print(f"\nFound {len(results)} member(s):")
+            for r in results:
+                member = r['member']
+                goal = r['latest_goal']
+                metric = r['latest_metric']
+                print(f"\nMember: {member['FirstName']} {member['LastName']} (ID: {member['MemberID']})")
+                print(f"  Email: {member['Email']}")
+                if member['Phone']:
+                    print(f"  Phone: {member['Phone']}")
+                if goal:
+                    print(f"  Latest Goal: {goal['GoalType']} (Status: {goal['GoalStatus']})")
+                if metric:
+                    print(f"  Latest Metric: Weight={metric['Weight']}lbs, Date={metric['RecordedDate']}")
+        else:
+            print(f"\nNo members found matching '{search_term}'.")
+            print("Tip: Try searching by first name, last name, or full name (e.g., 'John' or 'John Doe')")
+    except ValueError as e:
+        print_error(db, e)
+
+
+_TRAINER_ACTIONS = {
+    1: _trainer_set_availability,
+    2: _trainer_view_schedule,
+    3: _trainer_lookup_member,
+}
+
+
+def _admin_assign_room(db: Session):
+    """Assign a room to a session"""
+    from app.admin_functions import assign_room_booking
+    
+    print_header("Assign Room Booking")
+    session_id = get_input("Session ID", int)
+    room_id = get_input("Room ID", int)
+    try:
+        assign_room_booking(db, session_id, room_id)
+        print(f"\n[OK] Room {room_id} assigned to session {session_id}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _admin_log_issue(db: Session):
+    """Log a maintenance issue"""
+    from app.admin_functions import log_maintenance_issue
+    
+    print_header("Log Maintenance Issue")
+    room_id = get_input("Room ID", int)
+    admin_id = get_input("Admin ID", int)
+    description = get_input("Issue Description")
+    equipment = get_input("Equipment Name (optional)", str) or None
+    priority = get_input("Priority (Low/Medium/High/Critical)", str) or "Medium"
+    
+    try:
+        issue = log_maintenance_issue(
+            db, room_id, admin_id, description, equipment, priority
+        )
+        print(f"\n[OK] Maintenance issue logged: Issue ID {issue['IssueID']}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _admin_update_issue(db: Session):
+    """Update a maintenance issue's status"""
+    from app.admin_functions import update_maintenance_status
+    
+    print_header("Update Maintenance Status")
+    issue_id = get_input("Issue ID", int)
+    status = get_input("New Status (Open/In Progress/Resolved/Closed)", str, allow_empty=True) or None
+    assigned_date = get_date_input("Assigned Repair Date (optional)")
+    try:
+        issue = update_maintenance_status(
+            db, 
+            issue_id, 
+            status=status,
+            assigned_repair_date=assigned_date
+        )
+        print(f"\n[OK] Issue {issue_id} updated to: {issue['Status']}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _admin_create_invoice(db: Session):
+    """Create an invoice dated today"""
+    from app.admin_functions import create_invoice
+    
+    print_header("Create Invoice")
+    payer_id = get_input("Payer (Member) ID", int)
+    invoice_number = get_input("Invoice Number", allow_empty=False)
+    amount = get_input("Amount", float, allow_empty=False)
+    description = get_input("Service Description", allow_empty=False)
+    session_id = get_input("Session ID (optional)", int, allow_empty=True) or None
+    due_date = get_date_input("Due Date", allow_empty=False)
+    
+    try:
+        invoice = create_invoice(
+            db,
+            payer_id,
+            invoice_number,
+            date.today(),
+            due_date,
+            amount,
+            description,
+            session_id=session_id
+        )
+        print(f"\n[OK] Invoice created: {invoice['InvoiceNumber']} - ${amount}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+def _admin_record_payment(db: Session):
+    """Record payment against an invoice"""
+    from app.admin_functions import record_payment
+    
+    print_header("Record Payment")
+    invoice_id = get_input("Invoice ID", int)
+    payment_method = get_input("Payment Method")
+    try:
+        invoice = record_payment(db, invoice_id, payment_method)
+        print(f"\n[OK] Payment recorded: {invoice['InvoiceNumber']} - Status: {invoice['PaymentStatus']}")
+    except ValueError as e:
+        print_error(db, e)
+
+
+_ADMIN_ACTIONS = {
+    1: _admin_assign_room,
+    2: _admin_log_issue,
+    3: _admin_update_issue,
+    4: _admin_create_invoice,
+    5: _admin_record_payment,
+}
+
+
+def _run_action(db: Session, actions, choice):
+    """
+    Dispatch a menu choice to its action helper.
+    The CLI keeps one session for its whole run, and SessionLocal does not
+    expire on commit, so every action ends with a rollback: it closes the
+    read transaction and expires loaded rows, letting the next screen see
+    writes made by other clients.
+    """
+    handler = actions.get(choice)
+    if handler is None:
+        print("\nInvalid option. Please try again.")
+        return
+    try:
+        handler(db)
+    finally:
+        db.rollback()
+
+
 def member_menu(db: Session):
     """Member role menu"""
     while True:
@@ -99,104 +457,10 @@ def member_menu(db: Session):
         print("6. Back to Main Menu")
         
         choice = get_input("\nSelect option", int)
-        
-        if choice == 1:
-            print_header("User Registration")
-            try:
-                member = register_member(
-                    db,
-                    first_name=get_input("First Name", allow_empty=False),
-                    last_name=get_input("Last Name", allow_empty=False),
-                    email=get_input("Email", allow_empty=False),
-                    date_of_birth=get_date_input("Date of Birth"),
-                    gender=get_input("Gender (M/F/O)", str, allow_empty=True) or None,
-                    phone=get_phone_input("Phone Number"),
-                    address=get_input("Address", str, allow_empty=True) or None
-                )
-                print(f"\n[OK] Successfully registered: {member.FirstName} {member.LastName} (ID: {member.MemberID})")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 2:
-            print_header("Update Profile")
-            member_id = get_input("Member ID", int)
-            try:
-                member = update_profile(
-                    db,
-                    member_id,
-                    first_name=get_input("First Name (leave empty to skip)", str, allow_empty=True) or None,
-                    last_name=get_input("Last Name (leave empty to skip)", str, allow_empty=True) or None,
-                    phone=get_phone_input("Phone Number (leave empty to skip)"),
-                    address=get_input("Address (leave empty to skip)", str, allow_empty=True) or None
-                )
-                print(f"\n[OK] Profile updated: {member.FirstName} {member.LastName}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 3:
-            print_header("Add Fitness Goal")
-            member_id = get_input("Member ID", int)
-            try:
-                goal = add_fitness_goal(
-                    db,
-                    member_id,
-                    goal_type=get_input("Goal Type", allow_empty=False),
-                    target_body_weight=get_input("Target Body Weight", float, allow_empty=True) or None,
-                    target_body_fat=get_input("Target Body Fat %", float, allow_empty=True) or None,
-                    target_date=get_date_input("Target Date")
-                )
-                print(f"\n[OK] Goal added: {goal.GoalType}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 4:
-            print_header("Log Health Metric")
-            member_id = get_input("Member ID", int)
-            try:
-                metric = log_health_metric(
-                    db,
-                    member_id,
-                    recorded_date=date.today(),
-                    weight=get_input("Weight", float) or None,
-                    height=get_input("Height", float) or None,
-                    body_fat_percentage=get_input("Body Fat %", float) or None,
-                    resting_heart_rate=get_input("Resting Heart Rate", int) or None
-                )
-                print(f"\n[OK] Health metric logged for date: {metric.RecordedDate}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 5:
-            print_header("Schedule PT Session")
-            member_id = get_input("Member ID", int)
-            trainer_id = get_input("Trainer ID", int)
-            room_id = get_input("Room ID (leave empty if none)", int, allow_empty=True) or None
-            session_date = get_date_input("Session Date", allow_empty=False)
-            start_time = get_input("Start Time (HH:MM, e.g., 10:30)", str, allow_empty=False)
-            end_time = get_input("End Time (HH:MM, e.g., 11:30)", str, allow_empty=False)
-            
-            try:
-                start = datetime.strptime(start_time, "%H:%M").time()
-                end = datetime.strptime(end_time, "%H:%M").time()
-                
-                session = schedule_pt_session(
-                    db,
-                    member_id,
-                    trainer_id,
-                    session_date,
-                    start,
-                    end,
-                    room_id=room_id
-                )
-                print(f"\n[OK] Session scheduled: Session ID {session.SessionID}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-            except Exception as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 6:
+        if choice == 6:
             break
         
+        _run_action(db, _MEMBER_ACTIONS, choice)
         input("\nPress Enter to continue...")
 
 
@@ -210,66 +474,10 @@ def trainer_menu(db: Session):
         print("4. Back to Main Menu")
         
         choice = get_input("\nSelect option", int)
-        
-        if choice == 1:
-            print_header("Set Availability")
-            trainer_id = get_input("Trainer ID", int)
-            session_date = get_input("Date (YYYY-MM-DD)", str)
-            start_time = get_input("Start Time (HH:MM)", str)
-            end_time = get_input("End Time (HH:MM)", str)
-            
-            try:
-                start = datetime.strptime(start_time, "%H:%M").time()
-                end = datetime.strptime(end_time, "%H:%M").time()
-                date_obj = datetime.strptime(session_date, "%Y-%m-%d").date()
-                
-                result = set_availability(db, trainer_id, date_obj, start, end)
-                print(f"\n[OK] {result['message']}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 2:
-            print_header("View Schedule")
-            trainer_id = get_input("Trainer ID", int)
-            try:
-                sessions = view_schedule(db, trainer_id)
-                if sessions:
-                    print(f"\nFound {len(sessions)} upcoming sessions:")
-                    for s in sessions:
-                        print(f"  - {s.SessionDate} {s.StartTime}-{s.EndTime}: {s.SessionType}")
-                else:
-                    print("\nNo upcoming sessions found.")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 3:
-            print_header("Member Lookup")
-            search_term = get_input("Search by name (first name, last name, or full name)", allow_empty=False)
-            try:
-                results = lookup_member(db, search_term)
-                if results:
-                    print(f"\nFound {len(results)} member(s):")
-                    for r in results:
-                        member = r['member']
-                        goal = r['latest_goal']
-                        metric = r['latest_metric']
-                        print(f"\nMember: {member.FirstName} {member.LastName} (ID: {member.MemberID})")
-                        print(f"  Email: {member.Email}")
-                        if member.Phone:
-                            print(f"  Phone: {member.Phone}")
-                        if goal:
-                            print(f"  Latest Goal: {goal.GoalType} (Status: {goal.GoalStatus})")
-                        if metric:
-                            print(f"  Latest Metric: Weight={metric.Weight}lbs, Date={metric.RecordedDate}")
-                else:
-                    print(f"\nNo members found matching '{search_term}'.")
-                    print("Tip: Try searching by first name, last name, or full name (e.g., 'John' or 'John Doe')")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 4:
+        if choice == 4:
             break
         
+        _run_action(db, _TRAINER_ACTIONS, choice)
         input("\nPress Enter to continue...")
 
 
@@ -285,93 +493,23 @@ def admin_menu(db: Session):
         print("6. Back to Main Menu")
         
         choice = get_input("\nSelect option", int)
-        
-        if choice == 1:
-            print_header("Assign Room Booking")
-            session_id = get_input("Session ID", int)
-            room_id = get_input("Room ID", int)
-            try:
-                session = assign_room_booking(db, session_id, room_id)
-                print(f"\n[OK] Room {room_id} assigned to session {session_id}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 2:
-            print_header("Log Maintenance Issue")
-            room_id = get_input("Room ID", int)
-            admin_id = get_input("Admin ID", int)
-            description = get_input("Issue Description")
-            equipment = get_input("Equipment Name (optional)", str) or None
-            priority = get_input("Priority (Low/Medium/High/Critical)", str) or "Medium"
-            
-            try:
-                issue = log_maintenance_issue(
-                    db, room_id, admin_id, description, equipment, priority
-                )
-                print(f"\n[OK] Maintenance issue logged: Issue ID {issue.IssueID}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 3:
-            print_header("Update Maintenance Status")
-            issue_id = get_input("Issue ID", int)
-            status = get_input("New Status (Open/In Progress/Resolved/Closed)", str, allow_empty=True) or None
-            assigned_date = get_date_input("Assigned Repair Date (optional)")
-            try:
-                issue = update_maintenance_status(
-                    db, 
-                    issue_id, 
-                    status=status,
-                    assigned_repair_date=assigned_date
-                )
-                print(f"\n[OK] Issue {issue_id} updated to: {issue.Status}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 4:
-            print_header("Create Invoice")
-            payer_id = get_input("Payer (Member) ID", int)
-            invoice_number = get_input("Invoice Number", allow_empty=False)
-            amount = get_input("Amount", float, allow_empty=False)
-            description = get_input("Service Description", allow_empty=False)
-            session_id = get_input("Session ID (optional)", int, allow_empty=True) or None
-            due_date = get_date_input("Due Date", allow_empty=False)
-            
-            try:
-                invoice = create_invoice(
-                    db,
-                    payer_id,
-                    invoice_number,
-                    date.today(),
-                    due_date,
-                    amount,
-                    description,
-                    session_id=session_id
-                )
-                print(f"\n[OK] Invoice created: {invoice.InvoiceNumber} - ${amount}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 5:
-            print_header("Record Payment")
-            invoice_id = get_input("Invoice ID", int)
-            payment_method = get_input("Payment Method")
-            try:
-                invoice = record_payment(db, invoice_id, payment_method)
-                print(f"\n[OK] Payment recorded: {invoice.InvoiceNumber} - Status: {invoice.PaymentStatus}")
-            except ValueError as e:
-                print(f"\n[ERROR] Error: {e}")
-        
-        elif choice == 6:
+        if choice == 6:
             break
         
+        _run_action(db, _ADMIN_ACTIONS, choice)
         input("\nPress Enter to continue...")
 
 
 def main():
     """Main menu"""
+    from database_advanced import watch_dashboard
+    
     db = SessionLocal()
     
+    # Refresh MemberDashboardView in the background as the menus write
+    stop_watching = threading.Event()
+    threading.Thread(target=watch_dashboard, args=(2.0, stop_watching), daemon=True).start()
+    
     try:
         while True:
             print_header("GYM MANAGEMENT SYSTEM")
@@ -396,6 +534,7 @@ def main():
                 print("\nInvalid option. Please try again.")
     
     finally:
+        stop_watching.set()
         db.close()
 
 
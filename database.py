@@ -3,8 +3,11 @@ Database Configuration and Setup
 Handles database connection, session management, and table creation
 """
 
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
+import csv
+import os
+from typing import Optional
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker, DeclarativeBase
 
 # Database configuration - global variables
 DB_CONFIG = { 
@@ -15,23 +18,85 @@ DB_CONFIG = {
     'password': 'postgres'
 }
 
+# Optional read replica for read-heavy paths (lookup_member, view_schedule).
+# Same keys as DB_CONFIG; leave as None to read from the primary.
+READ_REPLICA_CONFIG = None
+
+# Connection pool sizing per engine. pool_size + max_overflow bounds the
+# concurrent connections each worker process can open.
+POOL_CONFIG = {
+    'pool_size': 25,
+    'max_overflow': 25,
+    'pool_timeout': 2,
+    'pool_recycle': 1800
+}
+
+# psycopg 3 driver options. Queries are prepared server-side on first
+# execution, so repeated lookups and INSERTs skip the parse/plan step on a warm
+# connection. PREPARED_STATEMENT_CACHE_SIZE bounds the statements kept per connection.
+CONNECT_ARGS = {
+    'prepare_threshold': 0
+}
+PREPARED_STATEMENT_CACHE_SIZE = 256
+
+# Rows per INSERT ... VALUES statement when a bulk insert is batched
+# ("insertmanyvalues"). SQLAlchemy still splits a page that would exceed the
+# driver's bind-parameter limit, so wide tables stay within it.
+INSERTMANYVALUES_PAGE_SIZE = 10000
+
+# init_db() bulk-loads any <Table>.csv found here (e.g. seed_csv/Member.csv)
+SEED_CSV_DIR = 'seed_csv'
+
+
+def _database_url(config: dict) -> str:
+    """Build a PostgreSQL URL (psycopg 3 driver) from a DB_CONFIG-style dict."""
+    return f"postgresql+psycopg://{config['username']}:{config['password']}@{config['host']}:{config['port']}/{config['database']}"
+
+
+def _create_engine(url: str):
+    """
+    Create an engine with the shared pool settings.
+    Pool settings keep a warm set of connections (LIFO reuse), recycle them
+    before server-side idle timeouts, and fail fast when exhausted.
+    """
+    new_engine = create_engine(
+        url,
+        echo=False,
+        pool_pre_ping=True,
+        pool_use_lifo=True,
+        connect_args=CONNECT_ARGS,
+        insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+        **POOL_CONFIG
+    )
+    
+    @event.listens_for(new_engine, "connect")
+    def _size_prepared_cache(dbapi_connection, connection_record):
+        dbapi_connection.prepared_max = PREPARED_STATEMENT_CACHE_SIZE
+    
+    return new_engine
+
+
 # Construct database URL
-DATABASE_URL = f"postgresql://{DB_CONFIG['username']}:{DB_CONFIG['password']}@{DB_CONFIG['host']}:{DB_CONFIG['port']}/{DB_CONFIG['database']}"
+DATABASE_URL = _database_url(DB_CONFIG)
 
 # Create engine
-engine = create_engine(
-    DATABASE_URL,
-    echo=False,
-    pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20
-)
+engine = _create_engine(DATABASE_URL)
+
+# Read-only engine: the replica when configured, otherwise the primary
+read_engine = _create_engine(_database_url(READ_REPLICA_CONFIG)) if READ_REPLICA_CONFIG else engine
 
-# Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Create SessionLocal class. Objects keep their loaded state after commit:
+# INSERT ... RETURNING already fills in keys and server-generated columns, so
+# the app functions return them without a follow-up refresh SELECT. A session
+# kept open across units of work (the CLI) must expire or roll back between
+# them, and Core-style UPDATEs expire the rows they change themselves.
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=read_engine)
 
-# Base class for declarative models
-Base = declarative_base()
+
+class Base(DeclarativeBase):
+    """Base class for declarative models."""
+    pass
 
 
 def get_db():
@@ -46,23 +111,81 @@ def get_db():
         db.close()
 
 
-def create_tables():
+def get_read_db():
+    """
+    Dependency function to get a session for read-only queries.
+    Bound to the read replica when READ_REPLICA_CONFIG is set.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+_async_session_factory = None
+
+
+def _get_async_session_factory():
+    """
+    Build the async engine and session factory on first use.
+    Deferred so greenlet is only required by callers that actually use
+    get_async_db(). psycopg 3 serves both engines; the async engine has its own
+    pool sized by POOL_CONFIG.
+    """
+    global _async_session_factory
+    if _async_session_factory is None:
+        from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+        
+        async_engine = create_async_engine(
+            DATABASE_URL,
+            echo=False,
+            pool_pre_ping=True,
+            pool_use_lifo=True,
+            connect_args=CONNECT_ARGS,
+            insertmanyvalues_page_size=INSERTMANYVALUES_PAGE_SIZE,
+            **POOL_CONFIG
+        )
+        _async_session_factory = async_sessionmaker(
+            bind=async_engine, autoflush=False, expire_on_commit=False
+        )
+    return _async_session_factory
+
+
+async def get_async_db():
+    """
+    Dependency function to get an AsyncSession for async frameworks.
+    The app functions run unchanged on it without blocking the event loop:
+        member = await db.run_sync(register_member, "Alice", "Johnson", "alice@example.com")
+    """
+    async with _get_async_session_factory()() as db:
+        yield db
+
+
+def create_tables(advanced_features: bool = True):
     """
     Create all tables in the database.
     This is equivalent to running DDL.sql - the ORM generates the SQL.
+    Pass advanced_features=False to defer views, triggers and secondary
+    indexes to a later setup_advanced_features() call.
     """
     # Import all models to ensure they're registered with Base
     from models import (
         Member, Trainer, AdminStaff, Room,
         PersonalTrainingSession, HealthMetric, FitnessGoal,
-        Invoice, MaintenanceIssue
+        Invoice, MaintenanceIssue, SessionEnrollment
     )
     
     # Create all tables
     Base.metadata.create_all(bind=engine)
     print("[OK] All tables created successfully!")
     
-    # Create advanced features (views, triggers, indexes)
+    if advanced_features:
+        _create_advanced_features()
+
+
+def _create_advanced_features():
+    """Create views, triggers and indexes, reporting (not raising) failures."""
     try:
         from database_advanced import setup_advanced_features
         setup_advanced_features()
@@ -79,7 +202,8 @@ def drop_tables():
     try:
         with engine.connect() as conn:
             from sqlalchemy import text
-            conn.execute(text("DROP VIEW IF EXISTS MemberDashboardView CASCADE"))
+            from database_advanced import _drop_dashboard_view
+            _drop_dashboard_view(conn)  # plain or materialized, depending on the database's age
             conn.execute(text("DROP VIEW IF EXISTS TrainerScheduleView CASCADE"))
             conn.commit()
     except Exception:
@@ -87,16 +211,100 @@ def drop_tables():
     
     # Drop tables
     Base.metadata.drop_all(bind=engine)
+    from app.existence import clear_exists_cache
+    clear_exists_cache()
     print("[OK] All tables dropped!")
 
 
+def _copy_into(table_name: str, columns, feed, options: str = '') -> int:
+    """
+    Run COPY <table> (<columns>) FROM STDIN on its own connection and commit.
+    feed(copy) writes the data; returns the number of rows loaded.
+    """
+    import models  # registers every table on Base.metadata
+    
+    table = Base.metadata.tables.get(table_name)
+    # Edge case: Only known tables and columns are interpolated into the COPY statement
+    if table is None:
+        raise ValueError(f"Unknown table: {table_name}")
+    unknown = [c for c in columns if c not in table.c]
+    if not columns or unknown:
+        raise ValueError(f"Invalid columns for {table_name}: {unknown or list(columns)}")
+    column_list = ', '.join(f'"{c}"' for c in columns)
+    
+    raw = engine.raw_connection()
+    try:
+        with raw.cursor() as cur:
+            with cur.copy(f'COPY "{table_name}" ({column_list}) FROM STDIN{options}') as copy:
+                feed(copy)
+            row_count = cur.rowcount
+            
+            # Explicit IDs in the data leave the SERIAL sequence behind; move it past them
+            pk = list(table.primary_key.columns)
+            if len(pk) == 1 and pk[0].autoincrement is True and pk[0].name in columns:
+                cur.execute(
+                    f'SELECT setval(pg_get_serial_sequence(\'"{table_name}"\', \'{pk[0].name}\'), '
+                    f'COALESCE(MAX("{pk[0].name}"), 1)) FROM "{table_name}"'
+                )
+        raw.commit()
+    finally:
+        raw.close()
+    
+    return row_count
+
+
+def bulk_seed(path: str, table_name: Optional[str] = None) -> int:
+    """
+    Bulk-load a CSV file into a table with COPY and return the row count.
+    The table defaults to the file name (seed_csv/Member.csv -> "Member") and
+    the header row names the columns. COPY streams rows without per-row
+    INSERT parsing, so this is the path for anything beyond sample data.
+    """
+    table_name = table_name or os.path.splitext(os.path.basename(path))[0]
+    with open(path, newline='') as f:
+        columns = next(csv.reader([f.readline()]), [])
+        
+        def feed(copy):
+            while block := f.read(65536):
+                copy.write(block)
+        
+        return _copy_into(table_name, columns, feed, ' WITH (FORMAT csv)')
+
+
+def copy_seed(table_name: str, columns, rows) -> int:
+    """
+    Bulk-load an iterable of row tuples (in columns order) with COPY.
+    Rows are streamed, so a generator never has to be materialized; psycopg
+    adapts each value (dates, None, numbers) as it writes it.
+    """
+    def feed(copy):
+        for row in rows:
+            copy.write_row(row)
+    
+    return _copy_into(table_name, columns, feed)
+
+
 def init_db():
     """
     Initialize database: create tables and optionally seed with sample data.
     This replaces DDL.sql and DML.sql when using ORM.
     """
-    # Create tables
-    create_tables()
+    # Create tables; keys and CHECK constraints come with them
+    create_tables(advanced_features=False)
+    
+    # Cached existence results may describe rows from a previous database
+    from app.existence import clear_exists_cache
+    clear_exists_cache()
+    
+    # Bulk-load CSV seed files when present, parents before children. This
+    # runs before the secondary indexes and triggers exist, so COPY does not
+    # maintain them row by row; they are built once over the loaded data.
+    for table in Base.metadata.sorted_tables:
+        path = os.path.join(SEED_CSV_DIR, f"{table.name}.csv")
+        if os.path.exists(path):
+            print(f"[OK] Loaded {bulk_seed(path)} rows into {table.name}")
+    
+    _create_advanced_features()
     
     # Optionally seed with sample data
     # seed_database()
@@ -3,9 +3,16 @@ Advanced SQL Features
 Implemented using SQLAlchemy ORM and raw SQL where necessary
 """
 
-from sqlalchemy import text, Index
+import threading
+from datetime import date
+from typing import Optional
+from sqlalchemy import text, Index, CheckConstraint, MetaData
+from sqlalchemy.schema import AddConstraint, CreateIndex
 from database import engine, Base
-from models import Member, HealthMetric, FitnessGoal, PersonalTrainingSession
+from models import (
+    HealthMetric, FitnessGoal, PersonalTrainingSession, Invoice,
+    MaintenanceIssue, SessionEnrollment
+)
 
 
 def create_views():
@@ -13,44 +20,66 @@ def create_views():
     Create database views using raw SQL (views are not directly supported in SQLAlchemy ORM).
     These views simplify common queries.
     """
-    with engine.connect() as conn:
+    # Both views are created in one transaction (a single BEGIN/COMMIT)
+    with engine.begin() as conn:
         # View 1: Member Dashboard View
-        # Combines Member with latest HealthMetric and latest FitnessGoal
+        # Combines Member with latest HealthMetric and latest FitnessGoal.
+        # Each LATERAL picks one row per member from the (MemberID, date DESC)
+        # indexes, and both session counts come from a single grouped pass.
+        # Materialized so reads are an indexed lookup; kept current by
+        # watch_dashboard() and refresh_dashboard().
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                -- Databases set up before the dashboard was materialized have a plain view
+                IF EXISTS (
+                    SELECT 1 FROM pg_class WHERE relname = 'memberdashboardview' AND relkind = 'v'
+                ) THEN
+                    DROP VIEW memberdashboardview;
+                END IF;
+            END $$;
+        """))
         conn.execute(text("""
-            CREATE OR REPLACE VIEW MemberDashboardView AS
+            CREATE MATERIALIZED VIEW IF NOT EXISTS MemberDashboardView AS
             SELECT
                 m."MemberID",
                 m."FirstName",
                 m."LastName",
                 m."Email",
                 m."MembershipStatus",
-                (SELECT h."Weight" 
-                 FROM "HealthMetric" h 
-                 WHERE h."MemberID" = m."MemberID" 
-                 ORDER BY h."RecordedDate" DESC 
-                 LIMIT 1) AS LatestWeight,
-                (SELECT h."RecordedDate" 
-                 FROM "HealthMetric" h 
-                 WHERE h."MemberID" = m."MemberID" 
-                 ORDER BY h."RecordedDate" DESC 
-                 LIMIT 1) AS LatestMetricDate,
-                (SELECT f."GoalType" 
-                 FROM "FitnessGoal" f 
-                 WHERE f."MemberID" = m."MemberID" 
-                 ORDER BY f."SetDate" DESC 
-                 LIMIT 1) AS CurrentGoal,
-                (SELECT COUNT(*) 
-                 FROM "PersonalTrainingSession" p 
-                 WHERE p."MemberID" = m."MemberID" 
-                 AND p."SessionDate" < CURRENT_DATE) AS PastSessionCount,
-                (SELECT COUNT(*) 
-                 FROM "PersonalTrainingSession" p 
-                 WHERE p."MemberID" = m."MemberID" 
-                 AND p."SessionDate" >= CURRENT_DATE) AS UpcomingSessionCount
-            FROM "Member" m;
+                lh."Weight" AS LatestWeight,
+                lh."RecordedDate" AS LatestMetricDate,
+                lg."GoalType" AS CurrentGoal,
+                COALESCE(ps.past, 0) AS PastSessionCount,
+                COALESCE(ps.upcoming, 0) AS UpcomingSessionCount
+            FROM "Member" m
+            LEFT JOIN LATERAL (
+                SELECT h."Weight", h."RecordedDate"
+                FROM "HealthMetric" h
+                WHERE h."MemberID" = m."MemberID"
+                ORDER BY h."RecordedDate" DESC
+                LIMIT 1
+            ) lh ON true
+            LEFT JOIN LATERAL (
+                SELECT f."GoalType"
+                FROM "FitnessGoal" f
+                WHERE f."MemberID" = m."MemberID"
+                ORDER BY f."SetDate" DESC
+                LIMIT 1
+            ) lg ON true
+            LEFT JOIN (
+                SELECT
+                    p."MemberID",
+                    COUNT(*) FILTER (WHERE p."SessionDate" < CURRENT_DATE) AS past,
+                    COUNT(*) FILTER (WHERE p."SessionDate" >= CURRENT_DATE) AS upcoming
+                FROM "PersonalTrainingSession" p
+                GROUP BY p."MemberID"
+            ) ps ON ps."MemberID" = m."MemberID";
         """))
-        conn.commit()
-        print("[OK] Created MemberDashboardView")
+        # REFRESH ... CONCURRENTLY requires a unique index on the view
+        conn.execute(text(
+            'CREATE UNIQUE INDEX IF NOT EXISTS idx_mdv_member ON MemberDashboardView ("MemberID")'
+        ))
         
         # View 2: Trainer Schedule View
         conn.execute(text("""
@@ -72,8 +101,8 @@ def create_views():
             WHERE p."SessionDate" >= CURRENT_DATE
             ORDER BY p."SessionDate", p."StartTime";
         """))
-        conn.commit()
-        print("[OK] Created TrainerScheduleView")
+    print("[OK] Created MemberDashboardView")
+    print("[OK] Created TrainerScheduleView")
 
 
 def create_indexes():
@@ -81,75 +110,458 @@ def create_indexes():
     Create indexes for improved query performance.
     Using SQLAlchemy Index objects.
     """
+    # Overlap checks filter on (party, SessionDate, StartTime < x, EndTime > y);
+    # these supersede the older (party, SessionDate) indexes
+    with engine.connect() as conn:
+        conn.execute(text("DROP INDEX IF EXISTS idx_session_trainer_date"))
+        conn.execute(text("DROP INDEX IF EXISTS idx_session_room_date"))
+        # Duplicated the unique constraint's own index on Member.Email
+        conn.execute(text("DROP INDEX IF EXISTS idx_member_email"))
+        # Rebuild the latest-row indexes created before they carried INCLUDE columns
+        for name in (
+            'idx_health_member_date', 'idx_goal_member_date',
+            'idx_session_trainer_slot', 'idx_session_room_slot'
+        ):
+            conn.execute(text(f"""
+                DO $$
+                BEGIN
+                    IF EXISTS (
+                        SELECT 1 FROM pg_indexes
+                        WHERE indexname = '{name}' AND indexdef NOT LIKE '%INCLUDE%'
+                    ) THEN
+                        DROP INDEX {name};
+                    END IF;
+                END $$;
+            """))
+        conn.commit()
+    
+    # Index objects built on the model columns would attach themselves to the
+    # shared tables, so CONCURRENTLY (set below) would leak into every later
+    # create_all(); build them on throwaway copies of the tables instead
+    scratch = MetaData()
+    pts, health, goal, invoice, issue, enrollment = (
+        model.__table__.to_metadata(scratch).c
+        for model in (
+            PersonalTrainingSession, HealthMetric, FitnessGoal,
+            Invoice, MaintenanceIssue, SessionEnrollment
+        )
+    )
     indexes = [
-        Index('idx_member_email', Member.Email),
-        Index('idx_session_trainer_date', PersonalTrainingSession.TrainerID, PersonalTrainingSession.SessionDate),
-        Index('idx_session_room_date', PersonalTrainingSession.RoomID, PersonalTrainingSession.SessionDate),
-        Index('idx_session_date_time', PersonalTrainingSession.SessionDate, PersonalTrainingSession.StartTime),
-        Index('idx_health_member_date', HealthMetric.MemberID, HealthMetric.RecordedDate.desc()),
-        Index('idx_goal_member_date', FitnessGoal.MemberID, FitnessGoal.SetDate.desc())
+        # Also serves a trainer's TrainerScheduleView rows already ordered by
+        # (SessionDate, StartTime); INCLUDE the view's other session columns so
+        # that scan is index-only
+        Index(
+            'idx_session_trainer_slot', pts.TrainerID, pts.SessionDate,
+            pts.StartTime, pts.EndTime,
+            postgresql_include=['SessionID', 'SessionType', 'MemberID', 'RoomID']
+        ),
+        # Room calendars (room, date range) read start/end/type straight from the index
+        Index(
+            'idx_session_room_slot', pts.RoomID, pts.SessionDate,
+            pts.StartTime, pts.EndTime,
+            postgresql_include=['SessionType']
+        ),
+        Index(
+            'idx_session_member_slot', pts.MemberID, pts.SessionDate,
+            pts.StartTime, pts.EndTime
+        ),
+        Index('idx_session_date_time', pts.SessionDate, pts.StartTime),
+        # INCLUDE the columns MemberDashboardView reads so its LATERAL picks are index-only
+        Index(
+            'idx_health_member_date', health.MemberID, health.RecordedDate.desc(),
+            postgresql_include=['Weight']
+        ),
+        Index(
+            'idx_goal_member_date', goal.MemberID, goal.SetDate.desc(),
+            postgresql_include=['GoalType', 'GoalStatus']
+        ),
+        Index('idx_invoice_payer', invoice.PayerID),
+        # Foreign keys without an index of their own: each one serves its
+        # lookups and keeps ON DELETE CASCADE / SET NULL from scanning the table
+        Index('idx_invoice_session', invoice.SessionID),
+        Index('idx_issue_room_status', issue.RoomID, issue.Status),
+        Index('idx_issue_admin', issue.AdminID),
+        Index('idx_enrollment_member', enrollment.MemberID)
     ]
     
-    for idx in indexes:
-        try:
-            idx.create(engine)
-        except Exception:
-            pass  # Index may already exist
+    # Skip indexes that already exist with one catalog query, and build missing
+    # ones CONCURRENTLY (outside a transaction) so writers are not blocked
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        existing = set(conn.execute(text(
+            "SELECT indexname FROM pg_indexes WHERE schemaname = current_schema()"
+        )).scalars())
+        for idx in indexes:
+            if idx.name in existing:
+                continue
+            idx.dialect_options['postgresql']['concurrently'] = True
+            conn.execute(CreateIndex(idx, if_not_exists=True))
     
+    roll_upcoming_session_index()
     print("[OK] Created all indexes")
 
 
+def roll_upcoming_session_index(cutoff: Optional[date] = None):
+    """
+    (Re)build idx_session_upcoming, a partial index over sessions on or after
+    cutoff (default: first day of the current month).
+    CURRENT_DATE cannot appear in an index predicate, so the cutoff is a
+    literal; run this monthly to drop the past month's rows from the index.
+    The schedule queries render their start date inline (literal_execute), so
+    the planner can prove the predicate; a bound parameter would not match
+    once PostgreSQL switches the prepared statement to a generic plan, and
+    queries on CURRENT_DATE itself cannot use the index either.
+    """
+    cutoff = cutoff or date.today().replace(day=1)
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        # Build the replacement first so the index never goes missing
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_session_upcoming_new"))
+        conn.execute(text(f"""
+            CREATE INDEX CONCURRENTLY idx_session_upcoming_new
+            ON "PersonalTrainingSession" ("TrainerID", "SessionDate", "StartTime")
+            WHERE "SessionDate" >= DATE '{cutoff.isoformat()}'
+        """))
+        conn.execute(text("DROP INDEX CONCURRENTLY IF EXISTS idx_session_upcoming"))
+        conn.execute(text("ALTER INDEX idx_session_upcoming_new RENAME TO idx_session_upcoming"))
+
+
 def create_triggers():
     """
     Create database triggers using raw SQL.
     Triggers maintain data consistency automatically.
     """
-    with engine.connect() as conn:
-        # Trigger 1: Update CurrentEnrollment when sessions are booked/cancelled
-        # This maintains consistency for group classes
+    # All trigger DDL is applied in one transaction (a single BEGIN/COMMIT)
+    with engine.begin() as conn:
+        # Trigger 1: Update CurrentEnrollment when members join/leave a class.
+        # Fires on the SessionEnrollment join table and touches the parent
+        # session row exactly once per enrollment change.
         conn.execute(text("""
             CREATE OR REPLACE FUNCTION update_enrollment()
             RETURNS TRIGGER AS $$
             BEGIN
-                IF TG_OP = 'INSERT' AND NEW."SessionType" = 'Group Class' THEN
+                IF TG_OP = 'INSERT' THEN
                     UPDATE "PersonalTrainingSession"
-                    SET "CurrentEnrollment" = "CurrentEnrollment" + 1
+                    SET "CurrentEnrollment" = COALESCE("CurrentEnrollment", 0) + 1
                     WHERE "SessionID" = NEW."SessionID";
-                ELSIF TG_OP = 'DELETE' AND OLD."SessionType" = 'Group Class' THEN
-                    UPDATE "PersonalTrainingSession"
-                    SET "CurrentEnrollment" = GREATEST("CurrentEnrollment" - 1, 0)
-                    WHERE "SessionID" = OLD."SessionID";
+                    RETURN NEW;
                 END IF;
-                RETURN NEW;
+                UPDATE "PersonalTrainingSession"
+                SET "CurrentEnrollment" = GREATEST(COALESCE("CurrentEnrollment", 0) - 1, 0)
+                WHERE "SessionID" = OLD."SessionID";
+                RETURN OLD;
             END;
             $$ LANGUAGE plpgsql;
         """))
+        conn.execute(text('DROP TRIGGER IF EXISTS trg_enroll ON "SessionEnrollment"'))
+        conn.execute(text("""
+            CREATE TRIGGER trg_enroll
+            AFTER INSERT OR DELETE ON "SessionEnrollment"
+            FOR EACH ROW EXECUTE FUNCTION update_enrollment()
+        """))
         
-        conn.commit()
-        print("[OK] Created trigger function: update_enrollment()")
+        # DurationMinutes is a generated column now (see migrate_session_duration);
+        # remove the trigger function that used to compute it
+        conn.execute(text("DROP FUNCTION IF EXISTS calculate_duration() CASCADE"))
         
-        # Trigger 2: Auto-calculate DurationMinutes from StartTime and EndTime
+        # Trigger 2: Flag MemberDashboardView as stale after writes to its sources.
+        # Statement-level so a bulk import sends one notification, and PostgreSQL
+        # folds identical notifications within a transaction. watch_dashboard()
+        # LISTENs, debounces these and calls refresh_dashboard().
         conn.execute(text("""
-            CREATE OR REPLACE FUNCTION calculate_duration()
+            CREATE OR REPLACE FUNCTION notify_dashboard_stale()
             RETURNS TRIGGER AS $$
             BEGIN
-                IF NEW."StartTime" IS NOT NULL AND NEW."EndTime" IS NOT NULL THEN
-                    NEW."DurationMinutes" := EXTRACT(EPOCH FROM (NEW."EndTime" - NEW."StartTime")) / 60;
-                END IF;
-                RETURN NEW;
+                PERFORM pg_notify('member_dashboard_stale', '');
+                RETURN NULL;
             END;
             $$ LANGUAGE plpgsql;
         """))
+        for table in ('HealthMetric', 'FitnessGoal', 'PersonalTrainingSession', 'Member'):
+            conn.execute(text(f'DROP TRIGGER IF EXISTS trg_dashboard_stale ON "{table}"'))
+            conn.execute(text(f"""
+                CREATE TRIGGER trg_dashboard_stale
+                AFTER INSERT OR UPDATE OR DELETE ON "{table}"
+                FOR EACH STATEMENT EXECUTE FUNCTION notify_dashboard_stale()
+            """))
+    print("[OK] Created trigger: trg_enroll (update_enrollment)")
+    print("[OK] Created trigger: trg_dashboard_stale")
+
+
+def refresh_dashboard() -> bool:
+    """
+    Recompute MemberDashboardView without blocking concurrent readers.
+    Returns False without doing anything when the view has not been created.
+    """
+    with engine.connect() as conn:
+        if conn.execute(text("SELECT to_regclass('memberdashboardview')")).scalar() is None:
+            return False
+        conn.execute(text("REFRESH MATERIALIZED VIEW CONCURRENTLY MemberDashboardView"))
+        conn.commit()
+    return True
+
+
+def watch_dashboard(debounce_seconds: float = 2.0, stop: Optional[threading.Event] = None):
+    """
+    Keep MemberDashboardView current: LISTEN for trg_dashboard_stale
+    notifications and refresh once writes have been quiet for debounce_seconds,
+    plus once when the date changes (the session counts split on CURRENT_DATE).
+    Runs until stop is set; start it in a background thread.
+    """
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("LISTEN member_dashboard_stale"))
+        listener = conn.connection.driver_connection
+        stale = False
+        refreshed_on = date.today()
+        while stop is None or not stop.is_set():
+            # Any notification restarts the quiet period
+            if any(True for _ in listener.notifies(timeout=debounce_seconds, stop_after=1)):
+                stale = True
+            elif stale or date.today() != refreshed_on:
+                # Edge case: a failed refresh is reported and retried on the
+                # next quiet period instead of ending the watcher
+                try:
+                    refresh_dashboard()
+                except Exception as e:
+                    print(f"Note: Dashboard refresh failed: {e}")
+                    continue
+                stale = False
+                refreshed_on = date.today()
+
+
+def migrate_session_duration():
+    """
+    Turn PersonalTrainingSession.DurationMinutes into a generated column on
+    databases created before it was one. No-op once converted.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'PersonalTrainingSession' AND column_name = 'DurationMinutes'
+                      AND is_generated = 'NEVER'
+                ) THEN
+                    ALTER TABLE "PersonalTrainingSession" DROP COLUMN "DurationMinutes";
+                    ALTER TABLE "PersonalTrainingSession" ADD COLUMN "DurationMinutes" INTEGER
+                        GENERATED ALWAYS AS ((EXTRACT(EPOCH FROM ("EndTime" - "StartTime")) / 60)::int) STORED;
+                END IF;
+            END $$;
+        """))
+        conn.commit()
+        print("[OK] PersonalTrainingSession.DurationMinutes is a generated column")
+
+
+def _drop_dashboard_view(conn):
+    """
+    Drop MemberDashboardView so a migration can alter the columns it reads;
+    create_views() rebuilds it. Older databases have it as a plain view,
+    newer ones as a materialized view.
+    """
+    conn.execute(text("""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_class WHERE relname = 'memberdashboardview' AND relkind = 'm'
+            ) THEN
+                DROP MATERIALIZED VIEW memberdashboardview;
+            ELSIF EXISTS (
+                SELECT 1 FROM pg_class WHERE relname = 'memberdashboardview' AND relkind = 'v'
+            ) THEN
+                DROP VIEW memberdashboardview;
+            END IF;
+        END $$;
+    """))
+
+
+def migrate_body_metric_types():
+    """
+    Convert the body measurement columns from NUMERIC(5,2) to DOUBLE PRECISION
+    on databases created before they were floats. No-op once converted.
+    MemberDashboardView reads HealthMetric.Weight, so it is dropped first.
+    """
+    with engine.connect() as conn:
+        needs_migration = conn.execute(text("""
+            SELECT EXISTS (
+                SELECT 1 FROM information_schema.columns
+                WHERE table_name IN ('HealthMetric', 'FitnessGoal') AND data_type = 'numeric'
+            )
+        """)).scalar()
+        if needs_migration:
+            _drop_dashboard_view(conn)
+            conn.execute(text("""
+                ALTER TABLE "HealthMetric"
+                    ALTER COLUMN "Height" TYPE DOUBLE PRECISION,
+                    ALTER COLUMN "Weight" TYPE DOUBLE PRECISION,
+                    ALTER COLUMN "BodyFatPercentage" TYPE DOUBLE PRECISION
+            """))
+            conn.execute(text("""
+                ALTER TABLE "FitnessGoal"
+                    ALTER COLUMN "TargetBodyWeight" TYPE DOUBLE PRECISION,
+                    ALTER COLUMN "TargetBodyFatPercentage" TYPE DOUBLE PRECISION
+            """))
+        conn.commit()
+        print("[OK] Body measurements stored as floats")
+
+
+def migrate_code_collations():
+    """
+    Switch the fixed-vocabulary code columns (gender, status, priority) to the
+    byte-wise "C" collation on databases created before the models declared it.
+    The columns are the ones whose model type carries collation="C". Only the
+    collation changes, so rows are not rewritten; indexes on them are rebuilt.
+    MemberDashboardView reads Member.MembershipStatus, so it is dropped first.
+    """
+    code_columns = {
+        (table.name, column.name): column.type.length
+        for table in Base.metadata.tables.values()
+        for column in table.columns
+        if getattr(column.type, 'collation', None) == 'C'
+    }
+    with engine.connect() as conn:
+        current = conn.execute(text("""
+            SELECT table_name, column_name, collation_name
+            FROM information_schema.columns
+            WHERE table_schema = current_schema() AND table_name = ANY(:tables)
+        """), {'tables': sorted({table_name for table_name, _ in code_columns})}).all()
+        pending = [
+            (table_name, column_name, code_columns[(table_name, column_name)])
+            for table_name, column_name, collation in current
+            if (table_name, column_name) in code_columns and collation != 'C'
+        ]
+        if pending:
+            _drop_dashboard_view(conn)
+        for table_name, column_name, length in pending:
+            conn.execute(text(
+                f'ALTER TABLE "{table_name}" ALTER COLUMN "{column_name}" TYPE VARCHAR({length}) COLLATE "C"'
+            ))
+        conn.commit()
+        print("[OK] Code columns use the C collation")
+
+
+def migrate_invoice_amounts():
+    """
+    Convert Invoice.Amount from NUMERIC dollars to BIGINT cents on databases
+    created before amounts were stored as integers. No-op once converted.
+    """
+    with engine.connect() as conn:
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF EXISTS (
+                    SELECT 1 FROM information_schema.columns
+                    WHERE table_name = 'Invoice' AND column_name = 'Amount'
+                      AND data_type = 'numeric'
+                ) THEN
+                    ALTER TABLE "Invoice"
+                    ALTER COLUMN "Amount" TYPE BIGINT USING round("Amount" * 100);
+                END IF;
+            END $$;
+        """))
+        conn.commit()
+        print("[OK] Invoice amounts stored in cents")
+
+
+def create_constraints():
+    """
+    Create PostgreSQL-specific constraints using raw SQL.
+    The exclusion constraints reject overlapping room bookings and double-booked
+    trainers atomically, so concurrent bookings cannot both pass an
+    application-level check.
+    """
+    with engine.connect() as conn:
+        # btree_gist provides the GiST operator class for plain equality (RoomID WITH =)
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS btree_gist"))
+        
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = 'no_room_overlap'
+                ) THEN
+                    ALTER TABLE "PersonalTrainingSession"
+                    ADD CONSTRAINT no_room_overlap EXCLUDE USING gist (
+                        "RoomID" WITH =,
+                        tsrange("SessionDate" + "StartTime", "SessionDate" + "EndTime") WITH &&
+                    );
+                END IF;
+            END $$;
+        """))
+        conn.execute(text("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (
+                    SELECT 1 FROM pg_constraint WHERE conname = 'no_trainer_overlap'
+                ) THEN
+                    ALTER TABLE "PersonalTrainingSession"
+                    ADD CONSTRAINT no_trainer_overlap EXCLUDE USING gist (
+                        "TrainerID" WITH =,
+                        tsrange("SessionDate" + "StartTime", "SessionDate" + "EndTime") WITH &&
+                    );
+                END IF;
+            END $$;
+        """))
+        conn.commit()
+        print("[OK] Created constraints: no_room_overlap, no_trainer_overlap")
+
+
+def create_check_constraints():
+    """
+    Add the model CHECK constraints to tables created before they existed.
+    create_all() only applies them to new tables. They are added NOT VALID so
+    legacy rows are left alone while every new INSERT/UPDATE is checked.
+    """
+    with engine.connect() as conn:
+        existing = set(conn.execute(text("SELECT conname FROM pg_constraint")).scalars())
+        added = []
+        for table in Base.metadata.sorted_tables:
+            for constraint in table.constraints:
+                if not isinstance(constraint, CheckConstraint) or constraint.name in existing:
+                    continue
+                ddl = str(AddConstraint(constraint).compile(dialect=conn.dialect))
+                conn.execute(text(ddl + " NOT VALID"))
+                added.append(constraint.name)
+        conn.commit()
+        print(f"[OK] Created check constraints: {', '.join(added) or 'none missing'}")
+
+
+def create_search_indexes():
+    """
+    Create trigram indexes for member name search.
+    lookup_member filters with ILIKE '%term%', which B-tree indexes cannot serve;
+    pg_trgm GIN indexes can.
+    """
+    with engine.connect() as conn:
+        # Databases created before FullName existed get the generated column here
+        conn.execute(text("""
+            ALTER TABLE "Member" ADD COLUMN IF NOT EXISTS "FullName" VARCHAR(101)
+            GENERATED ALWAYS AS ("FirstName" || ' ' || "LastName") STORED
+        """))
+        conn.execute(text("CREATE EXTENSION IF NOT EXISTS pg_trgm"))
+        for name, column in (
+            ('idx_member_fullname_trgm', 'FullName'),
+            ('idx_member_firstname_trgm', 'FirstName'),
+            ('idx_member_lastname_trgm', 'LastName'),
+        ):
+            conn.execute(text(
+                f'CREATE INDEX IF NOT EXISTS {name} ON "Member" USING gin ("{column}" gin_trgm_ops)'
+            ))
         conn.commit()
-        print("[OK] Created trigger function: calculate_duration()")
+        print("[OK] Created trigram indexes for member search")
 
 
 def setup_advanced_features():
     """Setup all advanced SQL features"""
     print("\nSetting up advanced SQL features...")
+    migrate_invoice_amounts()
+    migrate_session_duration()
+    migrate_body_metric_types()
+    migrate_code_collations()
     create_views()
     create_indexes()
+    create_search_indexes()
     create_triggers()
+    create_check_constraints()
+    create_constraints()
     print("\n[OK] All advanced features created!")
 
 
@@ -10,6 +10,7 @@ from .health_metric import HealthMetric
 from .fitness_goal import FitnessGoal
 from .invoice import Invoice
 from .maintenance_issue import MaintenanceIssue
+from .session_enrollment import SessionEnrollment
 
 __all__ = [
     'Member',
@@ -20,6 +21,7 @@ __all__ = [
     'HealthMetric',
     'FitnessGoal',
     'Invoice',
-    'MaintenanceIssue'
+    'MaintenanceIssue',
+    'SessionEnrollment'
 ]
 
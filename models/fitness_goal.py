@@ -3,7 +3,7 @@ FitnessGoal Entity Model
 Maps to the FitnessGoal table in the database
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, Text, ForeignKey, CheckConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -17,6 +17,14 @@ class FitnessGoal(Base):
     - Many-to-One with Member
     """
     __tablename__ = 'FitnessGoal'
+    __table_args__ = (
+        CheckConstraint('"TargetBodyWeight" > 0 AND "TargetBodyWeight" <= 1000', name='ck_fitnessgoal_target_weight'),
+        CheckConstraint('"TargetBodyFatPercentage" BETWEEN 0 AND 100', name='ck_fitnessgoal_target_body_fat'),
+        CheckConstraint(
+            '"GoalStatus" IN (\'Active\', \'Completed\', \'Cancelled\', \'On Hold\')',
+            name='ck_fitnessgoal_status'
+        ),
+    )
     
     # Primary Key
     GoalID = Column(Integer, primary_key=True, autoincrement=True)
@@ -26,15 +34,15 @@ class FitnessGoal(Base):
     
     # Attributes
     GoalType = Column(String(50))
-    TargetBodyWeight = Column(Numeric(5, 2))
-    TargetBodyFatPercentage = Column(Numeric(5, 2))
+    TargetBodyWeight = Column(Float)
+    TargetBodyFatPercentage = Column(Float)
     SetDate = Column(Date)
     TargetDate = Column(Date)
-    GoalStatus = Column(String(20))
+    GoalStatus = Column(String(20, collation="C"))
     Notes = Column(Text)
     
     # Relationships
-    member = relationship("Member", back_populates="fitness_goals", lazy="joined")
+    member = relationship("Member", back_populates="fitness_goals", lazy="selectin")
     
     def __repr__(self):
         return f"<FitnessGoal(GoalID={self.GoalID}, MemberID={self.MemberID}, Type='{self.GoalType}')>"
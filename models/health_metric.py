@@ -3,7 +3,7 @@ HealthMetric Entity Model
 Maps to the HealthMetric table in the database
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Float, Text, ForeignKey, CheckConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -17,6 +17,12 @@ class HealthMetric(Base):
     - Many-to-One with Member
     """
     __tablename__ = 'HealthMetric'
+    __table_args__ = (
+        CheckConstraint('"Height" > 0 AND "Height" <= 300', name='ck_healthmetric_height'),
+        CheckConstraint('"Weight" > 0 AND "Weight" <= 1000', name='ck_healthmetric_weight'),
+        CheckConstraint('"BodyFatPercentage" BETWEEN 0 AND 100', name='ck_healthmetric_body_fat'),
+        CheckConstraint('"RestingHeartRate" BETWEEN 30 AND 200', name='ck_healthmetric_heart_rate'),
+    )
     
     # Primary Key
     HealthMetricID = Column(Integer, primary_key=True, autoincrement=True)
@@ -26,14 +32,14 @@ class HealthMetric(Base):
     
     # Attributes
     RecordedDate = Column(Date, nullable=False)
-    Height = Column(Numeric(5, 2))
-    Weight = Column(Numeric(5, 2))
-    BodyFatPercentage = Column(Numeric(5, 2))
+    Height = Column(Float)
+    Weight = Column(Float)
+    BodyFatPercentage = Column(Float)
     RestingHeartRate = Column(Integer)
     Notes = Column(Text)
     
     # Relationships
-    member = relationship("Member", back_populates="health_metrics", lazy="joined")
+    member = relationship("Member", back_populates="health_metrics", lazy="selectin")
     
     def __repr__(self):
         return f"<HealthMetric(HealthMetricID={self.HealthMetricID}, MemberID={self.MemberID}, Date={self.RecordedDate})>"
@@ -3,8 +3,9 @@ Invoice Entity Model
 Maps to the Invoice table in the database
 """
 
-from sqlalchemy import Column, Integer, String, Date, Numeric, ForeignKey
+from sqlalchemy import Column, Integer, BigInteger, String, Date, ForeignKey, CheckConstraint
 from sqlalchemy.orm import relationship
+from sqlalchemy.ext.hybrid import hybrid_property
 from database import Base
 
 
@@ -17,6 +18,10 @@ class Invoice(Base):
     - Many-to-Zero-or-One with PersonalTrainingSession
     """
     __tablename__ = 'Invoice'
+    __table_args__ = (
+        CheckConstraint('"Amount" > 0 AND "Amount" <= 100000000', name='ck_invoice_amount'),
+        CheckConstraint('"DueDate" >= "InvoiceDate"', name='ck_invoice_due_date'),
+    )
     
     # Primary Key
     InvoiceID = Column(Integer, primary_key=True, autoincrement=True)
@@ -31,16 +36,21 @@ class Invoice(Base):
     # Attributes
     InvoiceDate = Column(Date, nullable=False)
     DueDate = Column(Date, nullable=False)
-    Amount = Column(Numeric(10, 2), nullable=False)
+    Amount = Column(BigInteger, nullable=False)  # in cents
     PaymentMethod = Column(String(30))
-    PaymentStatus = Column(String(20), default='Pending')
+    PaymentStatus = Column(String(20, collation="C"), default='Pending')
     ServiceDescription = Column(String(200))
     PaidDate = Column(Date)
     
     # Relationships
-    payer = relationship("Member", back_populates="invoices", foreign_keys=[PayerID], lazy="joined")
-    session = relationship("PersonalTrainingSession", back_populates="invoices", lazy="joined")
+    payer = relationship("Member", back_populates="invoices", foreign_keys=[PayerID], lazy="select")
+    session = relationship("PersonalTrainingSession", back_populates="invoices", lazy="select")
+    
+    @hybrid_property
+    def amount_dollars(self):
+        """Invoice amount in dollars (Amount is stored in cents)"""
+        return self.Amount / 100.0
     
     def __repr__(self):
-        return f"<Invoice(InvoiceID={self.InvoiceID}, Number='{self.InvoiceNumber}', Amount={self.Amount}, Status='{self.PaymentStatus}')>"
+        return f"<Invoice(InvoiceID={self.InvoiceID}, Number='{self.InvoiceNumber}', Amount={self.amount_dollars:.2f}, Status='{self.PaymentStatus}')>"
 
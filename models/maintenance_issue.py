@@ -3,7 +3,7 @@ MaintenanceIssue Entity Model
 Maps to the MaintenanceIssue table in the database
 """
 
-from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Text, ForeignKey, CheckConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -17,6 +17,16 @@ class MaintenanceIssue(Base):
     - Many-to-One with AdminStaff
     """
     __tablename__ = 'MaintenanceIssue'
+    __table_args__ = (
+        CheckConstraint(
+            '"Priority" IN (\'Low\', \'Medium\', \'High\', \'Critical\')',
+            name='ck_issue_priority'
+        ),
+        CheckConstraint(
+            '"Status" IN (\'Open\', \'In Progress\', \'Resolved\', \'Closed\')',
+            name='ck_issue_status'
+        ),
+    )
     
     # Primary Key
     IssueID = Column(Integer, primary_key=True, autoincrement=True)
@@ -29,15 +39,15 @@ class MaintenanceIssue(Base):
     IssueDescription = Column(Text, nullable=False)
     EquipmentName = Column(String(100))  # Name of equipment if specific
     ReportedDate = Column(Date, nullable=False)
-    Priority = Column(String(20))  # 'Low', 'Medium', 'High', 'Critical'
-    Status = Column(String(20), default='Open')  # 'Open', 'In Progress', 'Resolved', 'Closed'
+    Priority = Column(String(20, collation="C"))  # 'Low', 'Medium', 'High', 'Critical'
+    Status = Column(String(20, collation="C"), default='Open')  # 'Open', 'In Progress', 'Resolved', 'Closed'
     AssignedRepairDate = Column(Date)
     ResolutionDate = Column(Date)
     ResolutionNotes = Column(Text)
     
     # Relationships
-    room = relationship("Room", back_populates="maintenance_issues", lazy="joined")
-    admin = relationship("AdminStaff", back_populates="maintenance_issues", lazy="joined")
+    room = relationship("Room", back_populates="maintenance_issues", lazy="selectin")
+    admin = relationship("AdminStaff", back_populates="maintenance_issues", lazy="selectin")
     
     def __repr__(self):
         return f"<MaintenanceIssue(IssueID={self.IssueID}, RoomID={self.RoomID}, Status='{self.Status}', Priority='{self.Priority}')>"
@@ -3,7 +3,7 @@ Member Entity Model
 Maps to the Member table in the database
 """
 
-from sqlalchemy import Column, Integer, String, Date
+from sqlalchemy import Column, Integer, String, Date, Computed, CheckConstraint
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -19,6 +19,13 @@ class Member(Base):
     - One-to-Many with Invoice (as payer)
     """
     __tablename__ = 'Member'
+    __table_args__ = (
+        CheckConstraint('"Gender" IN (\'M\', \'F\', \'O\')', name='ck_member_gender'),
+        CheckConstraint(
+            '"MembershipStatus" IN (\'Active\', \'Inactive\', \'Suspended\', \'Cancelled\')',
+            name='ck_member_status'
+        ),
+    )
     
     # Primary Key
     MemberID = Column(Integer, primary_key=True, autoincrement=True)
@@ -27,36 +34,45 @@ class Member(Base):
     FirstName = Column(String(50), nullable=False)
     LastName = Column(String(50), nullable=False)
     DateOfBirth = Column(Date)
-    Gender = Column(String(1))
+    Gender = Column(String(1, collation="C"))
     Email = Column(String(100), unique=True, nullable=False)
     Phone = Column(String(20))
     Address = Column(String(200))
     JoinDate = Column(Date)
-    MembershipStatus = Column(String(20))
+    MembershipStatus = Column(String(20, collation="C"))
+    
+    # Generated "FirstName LastName" for trigram-indexed name search
+    FullName = Column(String(101), Computed('"FirstName" || \' \' || "LastName"', persisted=True))
     
     # Relationships (lazy loading by default)
     health_metrics = relationship(
         "HealthMetric", 
         back_populates="member", 
         cascade="all, delete-orphan",
+        order_by="HealthMetric.RecordedDate.desc()",
+        passive_deletes=True,
         lazy="select"
     )
     fitness_goals = relationship(
         "FitnessGoal", 
         back_populates="member", 
         cascade="all, delete-orphan",
+        order_by="FitnessGoal.SetDate.desc()",
+        passive_deletes=True,
         lazy="select"
     )
     sessions = relationship(
         "PersonalTrainingSession", 
         back_populates="member", 
         cascade="all, delete-orphan",
+        passive_deletes=True,
         lazy="select"
     )
     invoices = relationship(
         "Invoice", 
         back_populates="payer", 
         foreign_keys="Invoice.PayerID",
+        passive_deletes=True,
         lazy="select"
     )
     
@@ -4,7 +4,7 @@ Maps to the PersonalTrainingSession table in the database
 Handles both Personal Training sessions and Group Classes via SessionType
 """
 
-from sqlalchemy import Column, Integer, String, Date, Time, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Date, Time, Text, ForeignKey, CheckConstraint, Computed
 from sqlalchemy.orm import relationship
 from database import Base
 
@@ -19,8 +19,22 @@ class PersonalTrainingSession(Base):
     - Many-to-One with Member
     - Many-to-One with Room
     - One-to-Zero-or-One with Invoice
+    - One-to-Many with SessionEnrollment (group class attendees)
+    
+    Loading: both sides of every pair are lazy="select". Most writes touch
+    only the foreign keys, and the schedule view asks for trainer, member
+    and room up front with selectinload.
     """
     __tablename__ = 'PersonalTrainingSession'
+    __table_args__ = (
+        CheckConstraint('"StartTime" < "EndTime"', name='ck_session_time_order'),
+        CheckConstraint('"DurationMinutes" BETWEEN 15 AND 480', name='ck_session_duration'),
+        CheckConstraint(
+            '"SessionType" IN (\'Personal Training\', \'Group Class\')',
+            name='ck_session_type'
+        ),
+        CheckConstraint('"MaxCapacity" BETWEEN 1 AND 100', name='ck_session_max_capacity'),
+    )
     
     # Primary Key
     SessionID = Column(Integer, primary_key=True, autoincrement=True)
@@ -34,17 +48,20 @@ class PersonalTrainingSession(Base):
     SessionDate = Column(Date, nullable=False)
     StartTime = Column(Time, nullable=False)
     EndTime = Column(Time, nullable=False)
-    DurationMinutes = Column(Integer)
+    # Generated column computed by PostgreSQL from the times (::int rounds);
+    # app/timeslots.stored_duration_minutes mirrors that rounding
+    DurationMinutes = Column(Integer, Computed('(EXTRACT(EPOCH FROM ("EndTime" - "StartTime")) / 60)::int', persisted=True))
     SessionType = Column(String(50))  # 'Personal Training' or 'Group Class'
     MaxCapacity = Column(Integer)  # NULL for PT, set for group classes
-    CurrentEnrollment = Column(Integer, default=0)  # for group classes
+    CurrentEnrollment = Column(Integer, default=0)  # for group classes; maintained by trigger
     Notes = Column(Text)
     
     # Relationships
-    trainer = relationship("Trainer", back_populates="sessions", lazy="joined")
-    member = relationship("Member", back_populates="sessions", lazy="joined")
-    room = relationship("Room", back_populates="sessions", lazy="joined")
-    invoices = relationship("Invoice", back_populates="session", lazy="select")
+    trainer = relationship("Trainer", back_populates="sessions", lazy="select")
+    member = relationship("Member", back_populates="sessions", lazy="select")
+    room = relationship("Room", back_populates="sessions", lazy="select")
+    invoices = relationship("Invoice", back_populates="session", passive_deletes=True, lazy="select")
+    enrollments = relationship("SessionEnrollment", back_populates="session", passive_deletes=True, lazy="select")
     
     def __repr__(self):
         return f"<PersonalTrainingSession(SessionID={self.SessionID}, Type='{self.SessionType}', Date={self.SessionDate})>"
@@ -31,12 +31,14 @@ class Room(Base):
     sessions = relationship(
         "PersonalTrainingSession", 
         back_populates="room",
+        passive_deletes=True,
         lazy="select"
     )
     maintenance_issues = relationship(
         "MaintenanceIssue", 
         back_populates="room", 
         cascade="all, delete-orphan",
+        passive_deletes=True,
         lazy="select"
     )
     
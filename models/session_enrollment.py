@@ -0,0 +1,35 @@
+"""
+SessionEnrollment Entity Model
+Maps to the SessionEnrollment table in the database
+"""
+
+from sqlalchemy import Column, Integer, Date, ForeignKey
+from sqlalchemy.orm import relationship
+from database import Base
+
+
+class SessionEnrollment(Base):
+    """
+    SessionEnrollment entity linking members to the group classes they join.
+    The update_enrollment trigger keeps PersonalTrainingSession.CurrentEnrollment
+    in step with the rows of this table.
+    
+    Relationships:
+    - Many-to-One with PersonalTrainingSession
+    - Many-to-One with Member
+    """
+    __tablename__ = 'SessionEnrollment'
+    
+    # Composite Primary Key (a member enrolls in a session at most once)
+    SessionID = Column(Integer, ForeignKey('PersonalTrainingSession.SessionID', ondelete='CASCADE'), primary_key=True)
+    MemberID = Column(Integer, ForeignKey('Member.MemberID', ondelete='CASCADE'), primary_key=True)
+    
+    # Attributes
+    EnrolledDate = Column(Date)
+    
+    # Relationships
+    session = relationship("PersonalTrainingSession", back_populates="enrollments", lazy="select")
+    member = relationship("Member", lazy="select")
+    
+    def __repr__(self):
+        return f"<SessionEnrollment(SessionID={self.SessionID}, MemberID={self.MemberID})>"
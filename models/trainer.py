@@ -24,7 +24,7 @@ class Trainer(Base):
     FirstName = Column(String(50), nullable=False)
     LastName = Column(String(50), nullable=False)
     DateOfBirth = Column(Date)
-    Gender = Column(String(1))
+    Gender = Column(String(1, collation="C"))
     Email = Column(String(100), unique=True, nullable=False)
     Phone = Column(String(20))
     Specialty = Column(String(100))
@@ -35,6 +35,7 @@ class Trainer(Base):
         "PersonalTrainingSession", 
         back_populates="trainer", 
         cascade="all, delete-orphan",
+        passive_deletes=True,
         lazy="select"
     )
     
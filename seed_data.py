@@ -4,7 +4,12 @@ This replaces DML.sql when using ORM - all data is inserted via ORM
 """
 
 from datetime import date, time
+from typing import List, Optional
+from sqlalchemy import insert, select, exists, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import Session
 from database import SessionLocal, create_tables
+from database_advanced import refresh_dashboard
 from models import (
     Member, Trainer, AdminStaff, Room,
     PersonalTrainingSession, HealthMetric, FitnessGoal,
@@ -12,19 +17,66 @@ from models import (
 )
 
 
-def seed_database():
+def _bulk_insert(
+    db: Session,
+    model,
+    rows: List[dict],
+    batch_size: int,
+    conflict_key: Optional[str] = None
+) -> List[int]:
+    """
+    Insert rows (column-name dicts) batch_size at a time with
+    INSERT ... RETURNING and return the primary keys in input order.
+    Rows never become ORM objects, so memory is bounded by one batch.
+    With conflict_key (a unique column), rows that already exist are skipped
+    via ON CONFLICT DO NOTHING and their existing keys are returned instead.
+    """
+    pk = model.__mapper__.primary_key[0]
+    if conflict_key is None:
+        stmt = insert(model).returning(pk, sort_by_parameter_order=True)
+        ids = []
+        for start in range(0, len(rows), batch_size):
+            ids.extend(db.scalars(stmt, rows[start:start + batch_size]))
+        return ids
+    
+    # Edge case: skipped rows return nothing, so map keys back by natural key
+    key = model.__table__.c[conflict_key]
+    stmt = pg_insert(model).on_conflict_do_nothing(index_elements=[key]).returning(key, pk)
+    ids_by_key = {}
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        ids_by_key.update(db.execute(stmt, batch).tuples().all())
+        missing = [row[conflict_key] for row in batch if row[conflict_key] not in ids_by_key]
+        if missing:
+            ids_by_key.update(db.execute(select(key, pk).where(key.in_(missing))).tuples().all())
+    return [ids_by_key[row[conflict_key]] for row in rows]
+
+
+def seed_database(batch_size: int = 10000):
     """
     Populate database with sample data using ORM.
     This demonstrates how DML operations are done via ORM instead of SQL.
+    Each table is inserted batch_size rows per statement.
     """
     db = SessionLocal()
     
     try:
         print("Seeding database with sample data...")
         
+        # Sample data can be re-seeded, so skip waiting for the WAL flush at
+        # COMMIT; applies to this transaction only
+        db.execute(text("SET LOCAL synchronous_commit = off"))
+        
+        # Re-runs keep existing people/rooms (matched on their unique keys);
+        # the dependent sample rows have no natural key, so they are only
+        # added on the first run
+        already_seeded = db.scalar(
+            select(exists().where(Member.Email == "john.doe@example.com"))
+        )
+        
         # Create Members
         members = [
-            Member(
+            dict(
                 FirstName="John",
                 LastName="Doe",
                 Email="john.doe@example.com",
@@ -35,7 +87,7 @@ def seed_database():
                 JoinDate=date(2023, 1, 15),
                 MembershipStatus="Active"
             ),
-            Member(
+            dict(
                 FirstName="Jane",
                 LastName="Smith",
                 Email="jane.smith@example.com",
@@ -46,7 +98,7 @@ def seed_database():
                 JoinDate=date(2023, 3, 10),
                 MembershipStatus="Active"
             ),
-            Member(
+            dict(
                 FirstName="Bob",
                 LastName="Johnson",
                 Email="bob.johnson@example.com",
@@ -57,13 +109,12 @@ def seed_database():
                 MembershipStatus="Active"
             )
         ]
-        db.add_all(members)
-        db.commit()
-        print(f"[OK] Created {len(members)} members")
+        member_ids = _bulk_insert(db, Member, members, batch_size, conflict_key="Email")
+        print(f"[OK] Ensured {len(members)} members")
         
         # Create Trainers
         trainers = [
-            Trainer(
+            dict(
                 FirstName="Mike",
                 LastName="Trainer",
                 Email="mike.trainer@example.com",
@@ -73,7 +124,7 @@ def seed_database():
                 Specialty="Strength Training",
                 HireDate=date(2020, 1, 15)
             ),
-            Trainer(
+            dict(
                 FirstName="Sarah",
                 LastName="Coach",
                 Email="sarah.coach@example.com",
@@ -84,13 +135,12 @@ def seed_database():
                 HireDate=date(2021, 3, 1)
             )
         ]
-        db.add_all(trainers)
-        db.commit()
-        print(f"[OK] Created {len(trainers)} trainers")
+        trainer_ids = _bulk_insert(db, Trainer, trainers, batch_size, conflict_key="Email")
+        print(f"[OK] Ensured {len(trainers)} trainers")
         
         # Create Admin Staff
         admins = [
-            AdminStaff(
+            dict(
                 FirstName="Admin",
                 LastName="Manager",
                 Email="admin@example.com",
@@ -101,55 +151,59 @@ def seed_database():
                 HireDate=date(2019, 1, 1)
             )
         ]
-        db.add_all(admins)
-        db.commit()
-        print(f"[OK] Created {len(admins)} admin staff")
+        admin_ids = _bulk_insert(db, AdminStaff, admins, batch_size, conflict_key="Email")
+        print(f"[OK] Ensured {len(admins)} admin staff")
         
         # Create Rooms
         rooms = [
-            Room(
+            dict(
                 RoomNumber="101",
                 RoomCapacity=10,
                 RoomType="Training Room",
                 AccessPermissions="Members Only"
             ),
-            Room(
+            dict(
                 RoomNumber="201",
                 RoomCapacity=20,
                 RoomType="Studio",
                 AccessPermissions="All Members"
             ),
-            Room(
+            dict(
                 RoomNumber="301",
                 RoomCapacity=5,
                 RoomType="Private",
                 AccessPermissions="Premium Members"
             )
         ]
-        db.add_all(rooms)
-        db.commit()
-        print(f"[OK] Created {len(rooms)} rooms")
+        room_ids = _bulk_insert(db, Room, rooms, batch_size, conflict_key="RoomNumber")
+        print(f"[OK] Ensured {len(rooms)} rooms")
+        
+        if already_seeded:
+            db.commit()
+            refresh_dashboard()
+            print("\n[OK] Sample data already present; skipped dependent rows")
+            return
         
         # Create Health Metrics
         health_metrics = [
-            HealthMetric(
-                MemberID=members[0].MemberID,
+            dict(
+                MemberID=member_ids[0],
                 RecordedDate=date(2024, 1, 1),
                 Height=70.0,
                 Weight=180.0,
                 BodyFatPercentage=20.0,
                 RestingHeartRate=65
             ),
-            HealthMetric(
-                MemberID=members[0].MemberID,
+            dict(
+                MemberID=member_ids[0],
                 RecordedDate=date(2024, 2, 1),
                 Height=70.0,
                 Weight=175.0,  # Weight loss tracked
                 BodyFatPercentage=18.5,
                 RestingHeartRate=62
             ),
-            HealthMetric(
-                MemberID=members[1].MemberID,
+            dict(
+                MemberID=member_ids[1],
                 RecordedDate=date(2024, 1, 15),
                 Height=65.0,
                 Weight=140.0,
@@ -157,14 +211,13 @@ def seed_database():
                 RestingHeartRate=70
             )
         ]
-        db.add_all(health_metrics)
-        db.commit()
+        _bulk_insert(db, HealthMetric, health_metrics, batch_size)
         print(f"[OK] Created {len(health_metrics)} health metrics")
         
         # Create Fitness Goals
         fitness_goals = [
-            FitnessGoal(
-                MemberID=members[0].MemberID,
+            dict(
+                MemberID=member_ids[0],
                 GoalType="Weight Loss",
                 TargetBodyWeight=170.0,
                 TargetBodyFatPercentage=15.0,
@@ -172,8 +225,8 @@ def seed_database():
                 TargetDate=date(2024, 12, 31),
                 GoalStatus="Active"
             ),
-            FitnessGoal(
-                MemberID=members[1].MemberID,
+            dict(
+                MemberID=member_ids[1],
                 GoalType="Muscle Gain",
                 TargetBodyWeight=145.0,
                 SetDate=date(2024, 1, 15),
@@ -181,81 +234,76 @@ def seed_database():
                 GoalStatus="Active"
             )
         ]
-        db.add_all(fitness_goals)
-        db.commit()
+        _bulk_insert(db, FitnessGoal, fitness_goals, batch_size)
         print(f"[OK] Created {len(fitness_goals)} fitness goals")
         
         # Create Sessions
         sessions = [
-            PersonalTrainingSession(
-                TrainerID=trainers[0].TrainerID,
-                MemberID=members[0].MemberID,
-                RoomID=rooms[0].RoomID,
+            dict(
+                TrainerID=trainer_ids[0],
+                MemberID=member_ids[0],
+                RoomID=room_ids[0],
                 SessionDate=date(2024, 12, 15),
                 StartTime=time(10, 0),
                 EndTime=time(11, 0),
-                DurationMinutes=60,
                 SessionType="Personal Training",
                 Notes="Focus on strength training"
             ),
-            PersonalTrainingSession(
-                TrainerID=trainers[1].TrainerID,
-                MemberID=members[1].MemberID,
-                RoomID=rooms[1].RoomID,
+            dict(
+                TrainerID=trainer_ids[1],
+                MemberID=member_ids[1],
+                RoomID=room_ids[1],
                 SessionDate=date(2024, 12, 16),
                 StartTime=time(14, 0),
                 EndTime=time(15, 0),
-                DurationMinutes=60,
                 SessionType="Personal Training",
                 Notes="Yoga session"
             )
         ]
-        db.add_all(sessions)
-        db.commit()
+        session_ids = _bulk_insert(db, PersonalTrainingSession, sessions, batch_size)
         print(f"[OK] Created {len(sessions)} sessions")
         
         # Create Invoices
         invoices = [
-            Invoice(
+            dict(
                 InvoiceNumber="INV-001",
-                PayerID=members[0].MemberID,
-                SessionID=sessions[0].SessionID,
+                PayerID=member_ids[0],
+                SessionID=session_ids[0],
                 InvoiceDate=date(2024, 12, 10),
                 DueDate=date(2024, 12, 31),
-                Amount=75.00,
+                Amount=7500,  # cents
                 PaymentMethod="Credit Card",
                 PaymentStatus="Paid",
                 ServiceDescription="Personal Training Session",
                 PaidDate=date(2024, 12, 10)
             ),
-            Invoice(
+            dict(
                 InvoiceNumber="INV-002",
-                PayerID=members[1].MemberID,
+                PayerID=member_ids[1],
                 InvoiceDate=date(2024, 12, 1),
                 DueDate=date(2024, 12, 31),
-                Amount=50.00,
+                Amount=5000,  # cents
                 PaymentStatus="Pending",
                 ServiceDescription="Monthly Membership Fee"
             )
         ]
-        db.add_all(invoices)
-        db.commit()
+        _bulk_insert(db, Invoice, invoices, batch_size)
         print(f"[OK] Created {len(invoices)} invoices")
         
         # Create Maintenance Issues
         maintenance_issues = [
-            MaintenanceIssue(
-                RoomID=rooms[0].RoomID,
-                AdminID=admins[0].AdminID,
+            dict(
+                RoomID=room_ids[0],
+                AdminID=admin_ids[0],
                 IssueDescription="Treadmill not working properly",
                 EquipmentName="Treadmill #3",
                 ReportedDate=date(2024, 12, 10),
                 Priority="High",
                 Status="Open"
             ),
-            MaintenanceIssue(
-                RoomID=rooms[1].RoomID,
-                AdminID=admins[0].AdminID,
+            dict(
+                RoomID=room_ids[1],
+                AdminID=admin_ids[0],
                 IssueDescription="Light bulb needs replacement",
                 ReportedDate=date(2024, 12, 12),
                 Priority="Low",
@@ -264,10 +312,12 @@ def seed_database():
                 ResolutionNotes="Replaced bulb"
             )
         ]
-        db.add_all(maintenance_issues)
-        db.commit()
+        _bulk_insert(db, MaintenanceIssue, maintenance_issues, batch_size)
         print(f"[OK] Created {len(maintenance_issues)} maintenance issues")
         
+        # Everything above lands in one transaction
+        db.commit()
+        refresh_dashboard()
         print("\n[OK] Database seeded successfully!")
         
     except Exception as e: